@@ -1,49 +1,203 @@
 import requests
 import time
 import logging
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, Callable, List, Optional
+from urllib.parse import urlsplit
 from .config_manager import ConfigManager
+from .api_key_pool import ApiKeyPool
+from .http_cassette import HttpCassette
+from .http_session import HttpSessionPool
+from .rate_limiter import RateLimiter
+from .response_cache import ResponseCache
+from .retry_policy import RetryPolicy
+from .single_flight import SingleFlight
 from shared.constants.api_constants import ApiConstants
+from shared.constants.message_constants import MessageConstants
+from shared.json_codec import JsonCodec
 
 class ApiClient:
 
-    def __init__(self, config_manager: ConfigManager):
+    def __init__(self, config_manager: ConfigManager, session_pool: Optional[HttpSessionPool] = None,
+                 rate_limiter: Optional[RateLimiter] = None, api_keys: Optional[List[str]] = None,
+                 response_cache: Optional[ResponseCache] = None, cassette: Optional[HttpCassette] = None,
+                 retry_policy: Optional[RetryPolicy] = None):
         self.config_manager = config_manager
-        self.api_key = ApiConstants.ETHERSCAN_API_KEY
+        self.session_pool = session_pool or HttpSessionPool()
+        self.rate_limiter = rate_limiter or RateLimiter()
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.single_flight = SingleFlight()
+        self.api_keys = api_keys or ApiConstants.ETHERSCAN_API_KEYS
+        self.api_key = self.api_keys[0] if self.api_keys else ""
         self.network_config = config_manager.get_network_config()
         self.api_url = self.network_config["api_url"]
+        self.api_key_pool = ApiKeyPool(self.api_keys, self.api_url, self.rate_limiter)
+
+        paths = config_manager.get_paths_config()
+        if cassette is None and ApiConstants.HTTP_CASSETTE_MODE:
+            cassette = HttpCassette(ApiConstants.HTTP_CASSETTE_PATH or paths["cassette_file"], ApiConstants.HTTP_CASSETTE_MODE)
+        self.cassette = cassette
+
+        self.response_cache = response_cache or ResponseCache(
+            paths["response_cache_file"],
+            bypass=ApiConstants.RESPONSE_CACHE_BYPASS,
+            disabled=self.cassette is not None
+        )
         self.max_retries = ApiConstants.MAX_RETRIES
-        self.delay_between_requests = ApiConstants.DELAY_BETWEEN_REQUESTS
         self.block_chunk_size = ApiConstants.BLOCK_CHUNK_SIZE
+
+    def close(self) -> None:
+
+        self.session_pool.close()
+        self.response_cache.close()
+        if self.cassette is not None:
+            self.cassette.save()
+
+    def _send(self, url: str, params: Dict[str, Any], api_key: Optional[str]) -> requests.Response:
+
+        if self.cassette is not None and self.cassette.is_replaying:
+            return self.cassette.replay(url, params)
+
+        self.rate_limiter.acquire(url, api_key)
+        response = self.session_pool.get(url, params=params, timeout=ApiConstants.REQUEST_TIMEOUT)
+
+        if self.cassette is not None:
+            self.cassette.record(url, params, response)
+
+        return response
         
-    def make_request_with_retry(self, url: str, params: Dict[str, Any],
-                                retries: Optional[int] = None) -> Optional[Dict[str, Any]]:
+    def _endpoint_label(self, url: str, params: Dict[str, Any]) -> str:
+
+        host = urlsplit(url).netloc.lower()
+        action = params.get("action")
+        return f"{host} {action}" if action else host
+
+    def make_request_with_retry(self, url: str, params: Dict[str, Any], retries: Optional[int] = None,
+                                cache_ttl: Optional[float] = None,
+                                validate: Optional[Callable[[Any], bool]] = None,
+                                decode: Callable[[str], Any] = JsonCodec.loads) -> Optional[Dict[str, Any]]:
+
+        flight_key = ResponseCache.make_key(url, params)
+        if decode is not JsonCodec.loads:
+            flight_key = f"{flight_key}:{id(decode)}"
+
+        return self.single_flight.do(
+            flight_key,
+            lambda: self._request_with_retry(url, params, retries, cache_ttl, validate, decode)
+        )
+
+    def discard_cached_response(self, url: str, params: Dict[str, Any]) -> None:
+
+        self.response_cache.delete(ResponseCache.make_key(url, params))
+
+    def _request_with_retry(self, url: str, params: Dict[str, Any], retries: Optional[int],
+                            cache_ttl: Optional[float],
+                            validate: Optional[Callable[[Any], bool]],
+                            decode: Callable[[str], Any]) -> Optional[Dict[str, Any]]:
 
         if retries is None:
             retries = self.max_retries
+
+        cache_key = None
+        if cache_ttl is not None:
+            cache_key = ResponseCache.make_key(url, params)
+            cached_body = self.response_cache.get(cache_key)
+            if cached_body is not None:
+                return decode(cached_body)
             
+        uses_key_pool = url == self.api_url
+        endpoint = self._endpoint_label(url, params)
+        breaker = self.retry_policy.breaker(url)
+
         for attempt in range(1, retries + 1):
+            if not breaker.allow_request():
+                logging.error(f"Circuit open for {endpoint}, failing fast")
+                return None
+
+            request_params = params
+            api_key = params.get("apikey")
+            if uses_key_pool:
+                api_key = self.api_key_pool.acquire()
+                request_params = {**params, "apikey": api_key}
+
+            response = None
+            throttled = False
+
             try:
-                response = requests.get(url, params=params, timeout=ApiConstants.REQUEST_TIMEOUT)
+                response = self._send(url, request_params, api_key)
+
+                if response.status_code >= 500:
+                    breaker.record_failure()
+                else:
+                    breaker.record_success()
                 
                 if response.status_code == 200:
-                    return response.json()
+                    data = decode(response.text)
+                    if self._is_rate_limited_response(data):
+                        throttled = True
+                        self._on_throttle(url, api_key, uses_key_pool)
+                        logging.warning(f"Rate limit reported in response body (attempt {attempt}), slowing down requests to {url}")
+                    elif uses_key_pool and self._is_key_rejected_response(data):
+                        self.api_key_pool.report_error(api_key or "")
+                        logging.error(f"API key rejected (attempt {attempt}): {data.get('result')}")
+                    elif validate is not None and not validate(data):
+                        logging.error(f"Invalid response from {endpoint} (attempt {attempt}): {data}")
+                    else:
+                        self.rate_limiter.on_success(url, api_key)
+                        if uses_key_pool:
+                            self.api_key_pool.report_success(api_key or "")
+                        if cache_key is not None and cache_ttl is not None and self._is_cacheable_response(url, data):
+                            self.response_cache.put(cache_key, response.text, cache_ttl)
+                        return data
                 elif response.status_code == 429:
-                    wait_time = self.delay_between_requests * attempt * 2
-                    logging.warning(f"Rate limit hit, waiting {wait_time}s")
-                    time.sleep(wait_time)
+                    throttled = True
+                    self._on_throttle(url, api_key, uses_key_pool)
+                    logging.warning(f"Rate limit hit (attempt {attempt}), slowing down requests to {url}")
                 else:
                     logging.error(f"HTTP {response.status_code}: {response.text}")
                     
             except requests.RequestException as e:
+                breaker.record_failure()
                 logging.error(f"Request error (attempt {attempt}): {e}")
             except Exception as e:
+                if response is None:
+                    breaker.record_failure()
                 logging.error(f"Unexpected error (attempt {attempt}): {e}")
-                
-            time.sleep(self.delay_between_requests * attempt)
+
+            if attempt < retries:
+                delay = self.retry_policy.delay_for(attempt, response, throttled)
+                self.retry_policy.record_retry(endpoint, delay)
+                if delay > 0 and not (self.cassette is not None and self.cassette.is_replaying):
+                    time.sleep(delay)
         
         return None
     
+    def _on_throttle(self, url: str, api_key: Optional[str], uses_key_pool: bool) -> None:
+
+        self.rate_limiter.on_throttle(url, api_key)
+        if uses_key_pool:
+            self.api_key_pool.report_error(api_key or "")
+
+    def _is_key_rejected_response(self, data: Any) -> bool:
+
+        if not isinstance(data, dict) or data.get("status") != "0":
+            return False
+
+        return "api key" in str(data.get("result", "")).lower()
+
+    def _is_rate_limited_response(self, data: Any) -> bool:
+
+        if not isinstance(data, dict) or data.get("status") != "0":
+            return False
+
+        return "rate limit" in str(data.get("result", "")).lower()
+
+    def _is_cacheable_response(self, url: str, data: Any) -> bool:
+
+        if url == self.api_url:
+            return self._validate_etherscan_response(data)
+
+        return data is not None
+
     def _validate_etherscan_response(self, data: Dict[str, Any]) -> bool:
 
         if not isinstance(data, dict) or "result" not in data:
@@ -59,21 +213,16 @@ class ApiClient:
     
     def etherscan_api_request(self, params: Dict[str, Any]) -> Dict[str, Any]:
 
-        params["apikey"] = self.api_key
-        
-        for attempt in range(1, self.max_retries + 1):
-            data = self.make_request_with_retry(self.api_url, params, retries=1)
+        data = self.make_request_with_retry(self.api_url, params, validate=self._validate_etherscan_response)
 
-            if data and self._validate_etherscan_response(data):
-                if data.get("message") in ["No transactions found", "No records found"]:
-                    return {"result": []}
-                return data
-            
-            logging.error(f"Invalid Etherscan response (attempt {attempt}): {data}")
-            
-        raise Exception("Failed to get valid response from Etherscan API")
+        if data is None:
+            raise Exception(MessageConstants.ERROR_API_REQUEST_FAILED)
+
+        if data.get("message") in ["No transactions found", "No records found"]:
+            return {"result": []}
+        return data
     
-    def get_wallet_transactions(self, wallet_address: str, count: int = 10) -> List[Dict[str, Any]]:
+    def get_wallet_transactions(self, wallet_address: str, count: int = 10) -> Optional[List[Dict[str, Any]]]:
 
         params = {
             "module": "account",
@@ -86,10 +235,15 @@ class ApiClient:
         
         try:
             data = self.etherscan_api_request(params)
-            return data.get("result", [])
         except Exception as e:
             logging.error(f"Error fetching wallet transactions for {wallet_address}: {e}")
-            return []
+            return None
+
+        result = data.get("result", [])
+        if not isinstance(result, list):
+            logging.error(f"Invalid wallet transactions response for {wallet_address}: {result}")
+            return None
+        return result
     
     def get_dexscreener_pairs(self, token_address: str,
                               retries: Optional[int] = None) -> Optional[List[Dict[str, Any]]]:
@@ -110,27 +264,19 @@ class ApiClient:
             "ids": token_id,
             "vs_currencies": "usd"
         }
-        
-        for attempt in range(1, 4):
-            try:
-                data = self.make_request_with_retry(url, params)
-                
-                if not data:
-                    continue
-                    
-                price = data.get(token_id, {}).get("usd")
-                if price is not None:
-                    return float(price)
-                
-                logging.error(f"No USD price found for {token_id}")
-                break
-                
-            except (ValueError, KeyError, TypeError) as e:
-                logging.error(f"Error parsing CoinGecko response (attempt {attempt}): {e}")
-            except Exception as e:
-                logging.error(f"Error fetching from CoinGecko (attempt {attempt}): {e}")
-            
-            if attempt < 3:
-                time.sleep(10 if attempt == 1 else self.delay_between_requests * attempt)
 
-        return None
\ No newline at end of file
+        data = self.make_request_with_retry(url, params)
+        if not data:
+            logging.error(f"Error fetching from CoinGecko for {token_id}")
+            return None
+
+        try:
+            price = data.get(token_id, {}).get("usd")
+            if price is not None:
+                return float(price)
+        except (ValueError, KeyError, TypeError, AttributeError) as e:
+            logging.error(f"Error parsing CoinGecko response: {e}")
+            return None
+
+        logging.error(f"No USD price found for {token_id}")
+        return None
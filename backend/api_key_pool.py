@@ -0,0 +1,96 @@
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Dict, List
+
+from .rate_limiter import RateLimiter, TokenBucket
+from shared.constants.api_constants import ApiConstants
+
+class ApiKeyState:
+
+    def __init__(self, key: str, bucket: TokenBucket):
+        self.key = key
+        self.bucket = bucket
+        self.request_count = 0
+        self.error_count = 0
+        self.consecutive_errors = 0
+        self.cooldown_until = 0.0
+        self.quota_day = ""
+        self.requests_today = 0
+
+    @property
+    def label(self) -> str:
+        return f"...{self.key[-4:]}" if len(self.key) > 4 else "(no key)"
+
+    def _roll_quota_day(self) -> None:
+
+        today = datetime.now(timezone.utc).strftime("%Y-%m-%d")
+        if today != self.quota_day:
+            self.quota_day = today
+            self.requests_today = 0
+
+    def is_healthy(self, now: float) -> bool:
+
+        self._roll_quota_day()
+        if self.requests_today >= ApiConstants.ETHERSCAN_DAILY_QUOTA:
+            return False
+        return now >= self.cooldown_until
+
+class ApiKeyPool:
+
+    def __init__(self, keys: List[str], url: str, rate_limiter: RateLimiter):
+        self._states = [ApiKeyState(key, rate_limiter.get_bucket(url, key)) for key in (keys or [""])]
+        self._by_key = {state.key: state for state in self._states}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._states)
+
+    def _take(self, state: ApiKeyState) -> str:
+
+        state.request_count += 1
+        state.requests_today += 1
+        return state.key
+
+    def acquire(self) -> str:
+
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                healthy = [state for state in self._states if state.is_healthy(now)]
+                if healthy:
+                    return self._take(max(healthy, key=lambda state: (state.bucket.available(), -state.request_count)))
+
+                wait_time = min(state.cooldown_until for state in self._states) - now
+                if wait_time <= 0:
+                    return self._take(min(self._states, key=lambda state: state.request_count))
+            time.sleep(wait_time)
+
+    def report_success(self, key: str) -> None:
+
+        with self._lock:
+            state = self._by_key.get(key)
+            if state is not None:
+                state.consecutive_errors = 0
+
+    def report_error(self, key: str) -> None:
+
+        with self._lock:
+            state = self._by_key.get(key)
+            if state is None:
+                return
+            state.error_count += 1
+            state.consecutive_errors += 1
+            cooldown = min(
+                ApiConstants.API_KEY_COOLDOWN_SECONDS * 2 ** (state.consecutive_errors - 1),
+                ApiConstants.API_KEY_MAX_COOLDOWN_SECONDS
+            )
+            state.cooldown_until = time.monotonic() + cooldown
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+
+        with self._lock:
+            return {
+                state.label: {"requests": state.request_count, "errors": state.error_count}
+                for state in self._states
+            }
@@ -0,0 +1,53 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, TypeVar
+
+from .api_client import ApiClient
+from shared.constants.api_constants import ApiConstants
+from shared.json_codec import JsonCodec
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+class AsyncApiClient:
+
+    def __init__(self, api_client: ApiClient, max_in_flight: Optional[int] = None):
+        self.api_client = api_client
+        self.max_in_flight = max_in_flight or ApiConstants.ASYNC_MAX_IN_FLIGHT
+        self._executor = ThreadPoolExecutor(max_workers=self.max_in_flight, thread_name_prefix="api")
+
+    async def _run(self, func: Callable[..., R], *args: Any) -> R:
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, partial(func, *args))
+
+    async def map_bounded(self, func: Callable[[T], Awaitable[R]], items: Iterable[T],
+                          limit: Optional[int] = None) -> List[R]:
+
+        semaphore = asyncio.Semaphore(limit or self.max_in_flight)
+
+        async def run(item: T) -> R:
+            async with semaphore:
+                return await func(item)
+
+        return list(await asyncio.gather(*(run(item) for item in items)))
+
+    async def make_request_with_retry(self, url: str, params: Dict[str, Any], retries: Optional[int] = None,
+                                      cache_ttl: Optional[float] = None,
+                                      validate: Optional[Callable[[Any], bool]] = None,
+                                      decode: Callable[[str], Any] = JsonCodec.loads) -> Optional[Dict[str, Any]]:
+
+        return await self._run(self.api_client.make_request_with_retry, url, params, retries, cache_ttl, validate, decode)
+
+    async def etherscan_api_request(self, params: Dict[str, Any]) -> Dict[str, Any]:
+
+        return await self._run(self.api_client.etherscan_api_request, params)
+
+    async def get_wallet_transactions(self, wallet_address: str, count: int = 10) -> Optional[List[Dict[str, Any]]]:
+
+        return await self._run(self.api_client.get_wallet_transactions, wallet_address, count)
+
+    def close(self) -> None:
+
+        self._executor.shutdown(wait=False)
@@ -0,0 +1,112 @@
+import bisect
+import logging
+import os
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .transfer import Transfer
+from shared.constants.api_constants import ApiConstants
+from shared.json_codec import JsonCodec
+
+class BlockIndex:
+
+    def __init__(self, file_path: Optional[str] = None, max_gap_seconds: Optional[int] = None):
+        self.file_path = file_path
+        self.max_gap_seconds = max_gap_seconds if max_gap_seconds is not None else ApiConstants.BLOCK_INDEX_MAX_GAP_SECONDS
+        self.hits = 0
+        self.misses = 0
+        self._answers: Dict[str, int] = {}
+        self._samples: List[Tuple[int, int]] = []
+        self._dirty = False
+        self._lock = threading.Lock()
+
+        if file_path and os.path.exists(file_path):
+            self._load()
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def _load(self) -> None:
+
+        if not self.file_path:
+            return
+
+        try:
+            data = JsonCodec.load_file(self.file_path)
+            self._answers = {key: int(block) for key, block in data.get("answers", {}).items()}
+            self._samples = sorted((int(timestamp), int(block)) for timestamp, block in data.get("samples", []))
+        except Exception as e:
+            logging.error(f"Error loading block index {self.file_path}: {e}")
+            self._answers, self._samples = {}, []
+
+    @staticmethod
+    def _answer_key(timestamp: int, closest: str) -> str:
+        return f"{timestamp}:{closest}"
+
+    def lookup(self, timestamp: int, closest: str) -> Optional[int]:
+
+        with self._lock:
+            block = self._answers.get(self._answer_key(timestamp, closest))
+            if block is None:
+                block = self._bracket(timestamp, closest)
+
+            if block is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return block
+
+    def _bracket(self, timestamp: int, closest: str) -> Optional[int]:
+
+        if closest == "after":
+            position = bisect.bisect_left(self._samples, (timestamp,)) - 1
+            if position < 0:
+                return None
+            sample_timestamp, block = self._samples[position]
+            return block if timestamp - sample_timestamp <= self.max_gap_seconds else None
+
+        position = bisect.bisect_right(self._samples, (timestamp, float("inf")))
+        if position >= len(self._samples):
+            return None
+        sample_timestamp, block = self._samples[position]
+        return block if sample_timestamp - timestamp <= self.max_gap_seconds else None
+
+    def add_answer(self, timestamp: int, closest: str, block: int) -> None:
+
+        with self._lock:
+            self._answers[self._answer_key(timestamp, closest)] = block
+            self._insert(timestamp, block)
+            self._dirty = True
+
+    def add_transfer_samples(self, transfers: Iterable[Transfer], max_timestamp: float) -> None:
+
+        with self._lock:
+            last_timestamp = None
+            for tx in transfers:
+                if tx.timestamp > max_timestamp:
+                    break
+                if last_timestamp is None or tx.timestamp - last_timestamp >= ApiConstants.BLOCK_INDEX_SAMPLE_SPACING_SECONDS:
+                    self._insert(tx.timestamp, tx.block)
+                    last_timestamp = tx.timestamp
+
+    def _insert(self, timestamp: int, block: int) -> None:
+
+        sample = (timestamp, block)
+        position = bisect.bisect_left(self._samples, sample)
+        if position < len(self._samples) and self._samples[position] == sample:
+            return
+        self._samples.insert(position, sample)
+        self._dirty = True
+
+    def save(self) -> None:
+
+        if not self.file_path or not self._dirty:
+            return
+
+        try:
+            os.makedirs(os.path.dirname(self.file_path), exist_ok=True)
+            with self._lock:
+                JsonCodec.save_file({"answers": self._answers, "samples": self._samples}, self.file_path)
+                self._dirty = False
+        except Exception as e:
+            logging.error(f"Error saving block index {self.file_path}: {e}")
@@ -1,27 +1,66 @@
-import time
+import asyncio
 import logging
-from typing import List, Dict, Any
+import time
+from typing import List, Dict, AsyncIterator, Optional, Sequence, Tuple
 from .api_client import ApiClient
+from .async_api_client import AsyncApiClient
+from .block_index import BlockIndex
+from .known_address_index import KnownAddressIndex
+from .transfer import Transfer, TransferTimeline
+from .transfer_store import TransferStore
+from .chunk_planner import AdaptiveChunkPlanner, SeamDeduplicator
+from .json_stream import StreamedJsonArray, StreamedJsonObject
+from .response_cache import ResponseCache
 from shared.constants.api_constants import ApiConstants
 
+_TOKENTX_DECODER = StreamedJsonObject.decoder("result")
+
 class BlockchainAnalyzer:
     
-    def __init__(self, api_client: ApiClient):
+    def __init__(self, api_client: ApiClient, async_api_client: Optional[AsyncApiClient] = None,
+                 block_index: Optional[BlockIndex] = None, transfer_store: Optional[TransferStore] = None):
         self.api_client = api_client
+        self.async_api_client = async_api_client or AsyncApiClient(api_client)
+        self.block_index = block_index or BlockIndex()
+        self.transfer_store = transfer_store
+        self.finalized_block = -1
+        self.chunk_concurrency = ApiConstants.CHUNK_FETCH_CONCURRENCY
+
+    def _finality_horizon(self) -> float:
+
+        return time.time() - float(self.api_client.network_config["finality_seconds"])
+
+    def _is_finalized_timestamp(self, timestamp: int) -> bool:
+
+        return timestamp <= self._finality_horizon()
+
+    def _cache_ttl_for_block(self, block: int) -> float:
+
+        if block <= self.finalized_block:
+            return ResponseCache.NO_EXPIRY
+        return ApiConstants.RESPONSE_CACHE_TIP_TTL_SECONDS
         
     def get_block_by_timestamp(self, timestamp: int, closest: str = "before") -> int:
+        finalized = self._is_finalized_timestamp(timestamp)
+
+        if finalized:
+            block = self.block_index.lookup(timestamp, closest)
+            if block is not None:
+                self.finalized_block = max(self.finalized_block, block)
+                return block
+
         params = {
             "module": "block",
             "action": "getblocknobytime", 
             "timestamp": timestamp,
-            "closest": closest,
-            "apikey": self.api_client.api_key
+            "closest": closest
         }
-        
+
         try:
             data = self.api_client.make_request_with_retry(
                 self.api_client.api_url, 
-                params
+                params,
+                cache_ttl=ResponseCache.NO_EXPIRY if finalized else ApiConstants.RESPONSE_CACHE_TIP_TTL_SECONDS
             )
             
             if not data or "result" not in data:
@@ -30,112 +69,204 @@ class BlockchainAnalyzer:
             if data.get("status") == "0":
                 raise Exception(f"API rejected the request: {data.get('result') or data.get('message')}")
 
-            return int(data["result"])
+            block = int(data["result"])
+            if finalized:
+                self.finalized_block = max(self.finalized_block, block)
+                self.block_index.add_answer(timestamp, closest, block)
+            return block
             
         except Exception as e:
             error_msg = f"Failed to fetch block number for timestamp {timestamp}: {e}"
             logging.error(error_msg)
             raise Exception(error_msg)
     
-    def get_token_transactions(self, startblock: int, endblock: int, token_contract_address: str) -> List[Dict[str, Any]]:
-        
+    def _chunk_retry_delay(self, attempt: int) -> float:
+
+        retry_policy = self.api_client.retry_policy
+        breaker = retry_policy.breaker(self.api_client.api_url)
+        return max(retry_policy.delay_for(attempt), breaker.seconds_until_probe())
+
+    async def _fetch_chunk_async(self, chunk: Tuple[int, int], token_contract_address: str,
+                                 delay: float = 0.0) -> Optional[Tuple[int, List[Transfer]]]:
+
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        current_start, current_end = chunk
+        params = {
+            "module": "account",
+            "action": "tokentx",
+            "contractaddress": token_contract_address,
+            "startblock": current_start,
+            "endblock": current_end,
+            "sort": "asc"
+        }
+
+        print(f"Pobieram transakcje dla bloków {current_start} - {current_end}...")
+
+        try:
+            data = await self.async_api_client.make_request_with_retry(
+                self.api_client.api_url,
+                params,
+                cache_ttl=self._cache_ttl_for_block(current_end),
+                decode=_TOKENTX_DECODER
+            )
+
+            if data and "result" in data and isinstance(data["result"], (list, StreamedJsonArray)):
+                transfers = []
+                result_count = 0
+                for tx in data["result"]:
+                    result_count += 1
+                    try:
+                        transfers.append(Transfer.from_api(tx))
+                    except (KeyError, ValueError, TypeError, AttributeError) as e:
+                        logging.warning(f"Skipping transaction with invalid fields: {tx}, error: {e}")
+                return result_count, transfers
+
+            logging.error(f"Invalid API response format for blocks {current_start}-{current_end}: {data}")
+
+        except Exception as e:
+            logging.error(f"Error processing data for blocks {current_start}-{current_end}: {e}")
+            self.api_client.discard_cached_response(self.api_client.api_url, params)
+
+        return None
+
+    async def iter_token_transactions_async(self, startblock: int, endblock: int,
+                                            token_contract_address: str) -> AsyncIterator[List[Transfer]]:
+
+        if self.transfer_store is None:
+            async for _, _, chunk_txs in self._iter_range_async(startblock, endblock, token_contract_address):
+                yield chunk_txs
+            return
+
+        chain_id = int(self.api_client.network_config["chain_id"])
+        stable_end = min(endblock, self.finalized_block)
+        missing = self.transfer_store.missing_intervals(chain_id, token_contract_address, startblock, stable_end)
+        cursor = startblock
+
+        if stable_end >= startblock:
+            print(f"Bloki {startblock} - {stable_end}: brakujące przedziały w lokalnym magazynie: {len(missing)}")
+
+        for interval_start, interval_end in missing + [(stable_end + 1, stable_end)]:
+            if cursor < interval_start:
+                for stored_txs in self.transfer_store.iter_load(chain_id, token_contract_address, cursor, interval_start - 1):
+                    yield stored_txs
+
+            if interval_start <= interval_end:
+                async for chunk_start, chunk_end, chunk_txs in self._iter_range_async(interval_start, interval_end,
+                                                                                     token_contract_address):
+                    self.transfer_store.add(chain_id, token_contract_address, chunk_start, chunk_end, chunk_txs)
+                    yield chunk_txs
+
+            cursor = interval_end + 1
+
+        if stable_end < endblock:
+            async for _, _, chunk_txs in self._iter_range_async(max(startblock, stable_end + 1), endblock,
+                                                                 token_contract_address):
+                yield chunk_txs
+
+    async def get_token_transactions_async(self, startblock: int, endblock: int,
+                                           token_contract_address: str) -> List[Transfer]:
+
         all_txs = []
-        current_start = startblock
-        
-        while current_start <= endblock:
-            current_end = min(current_start + ApiConstants.BLOCK_CHUNK_SIZE - 1, endblock)
-            
-            params = {
-                "module": "account",
-                "action": "tokentx",
-                "contractaddress": token_contract_address,
-                "startblock": current_start,
-                "endblock": current_end,
-                "sort": "asc",
-                "apikey": self.api_client.api_key
-            }
-            
-            print(f"Pobieram transakcje dla bloków {current_start} - {current_end}...")
-            
-            try:
-                data = self.api_client.make_request_with_retry(
-                    self.api_client.api_url, 
-                    params
-                )
-                
-                if data and "result" in data and isinstance(data["result"], list):
-                    txs = data["result"]
-                    print(f"Liczba transakcji w odpowiedzi: {len(txs)}")
-                    all_txs.extend(txs)
-                else:
-                    logging.error(f"Invalid API response format for blocks {current_start}-{current_end}: {data}")
-                    
-            except Exception as e:
-                logging.error(f"Error processing data for blocks {current_start}-{current_end}: {e}")
-            finally:
-                current_start = current_end + 1
-                time.sleep(ApiConstants.DELAY_BETWEEN_REQUESTS)
-        
+        async for chunk_txs in self.iter_token_transactions_async(startblock, endblock, token_contract_address):
+            all_txs.extend(chunk_txs)
         return all_txs
+
+    async def _iter_range_async(self, startblock: int, endblock: int,
+                                token_contract_address: str) -> AsyncIterator[Tuple[int, int, List[Transfer]]]:
+
+        concurrency = min(self.chunk_concurrency, self.async_api_client.max_in_flight)
+        planner = AdaptiveChunkPlanner(startblock, endblock, lag=concurrency)
+        deduplicator = SeamDeduplicator()
+        in_flight: Dict["asyncio.Future[Optional[Tuple[int, List[Transfer]]]]", Tuple[int, int]] = {}
+        attempts: Dict[Tuple[int, int], int] = {}
+        completed: Dict[int, Tuple[int, List[Transfer]]] = {}
+        merge_cursor = startblock
+
+        try:
+            while planner.has_work() or in_flight:
+                while len(in_flight) < concurrency:
+                    chunk = planner.next_chunk()
+                    if chunk is None:
+                        break
+                    in_flight[asyncio.ensure_future(self._fetch_chunk_async(chunk, token_contract_address))] = chunk
+
+                done, _ = await asyncio.wait(list(in_flight), return_when=asyncio.FIRST_COMPLETED)
+
+                for task in done:
+                    chunk_start, chunk_end = chunk = in_flight.pop(task)
+                    fetched = task.result()
+
+                    if fetched is None:
+                        attempts[chunk] = attempts.get(chunk, 0) + 1
+                        if attempts[chunk] >= ApiConstants.CHUNK_MAX_ATTEMPTS:
+                            raise Exception(f"Failed to fetch token transactions for blocks {chunk_start}-{chunk_end} "
+                                            f"after {attempts[chunk]} attempts")
+                        delay = self._chunk_retry_delay(attempts[chunk])
+                        print(f"Ponawiam pobieranie bloków {chunk_start} - {chunk_end} za {delay:.1f} s...")
+                        retry = self._fetch_chunk_async(chunk, token_contract_address, delay)
+                        in_flight[asyncio.ensure_future(retry)] = chunk
+                        continue
+
+                    result_count, chunk_txs = fetched
+                    if planner.split(chunk, result_count):
+                        print(f"Bloki {chunk_start} - {chunk_end} osiągnęły limit {ApiConstants.ETHERSCAN_MAX_RESULTS} wyników, dzielę zakres.")
+                        continue
+
+                    print(f"Liczba transakcji w blokach {chunk_start} - {chunk_end}: {len(chunk_txs)}")
+                    if chunk_start <= self.finalized_block:
+                        self.block_index.add_transfer_samples(chunk_txs, self._finality_horizon())
+                    completed[chunk_start] = (chunk_end, chunk_txs)
+
+                while merge_cursor in completed:
+                    chunk_end, chunk_txs = completed.pop(merge_cursor)
+                    planner.observe((merge_cursor, chunk_end), len(chunk_txs))
+                    yield merge_cursor, chunk_end, deduplicator.filter(chunk_txs)
+                    merge_cursor = chunk_end + 1
+        finally:
+            for task in in_flight:
+                task.cancel()
+
+        if deduplicator.duplicates:
+            print(f"Usunięto {deduplicator.duplicates} zduplikowanych transferów na granicach zakresów.")
+
+    def get_token_transactions(self, startblock: int, endblock: int, token_contract_address: str) -> List[Transfer]:
+
+        return asyncio.run(self.get_token_transactions_async(startblock, endblock, token_contract_address))
     
-    def filter_transactions_by_timerange(self, transactions: List[Dict[str, Any]],
-                                       start_timestamp: int, end_timestamp: int) -> List[Dict[str, Any]]:
+    def filter_transactions_by_timerange(self, transactions: Sequence[Transfer],
+                                       start_timestamp: int, end_timestamp: int) -> TransferTimeline:
         
-        filtered = []
-        
-        for tx in transactions:
-            try:
-                tx_timestamp = int(tx["timeStamp"])
-                if start_timestamp <= tx_timestamp <= end_timestamp:
-                    filtered.append(tx)
-            except (ValueError, KeyError) as e:
-                logging.warning(f"Skipping transaction with invalid timestamp: {tx}, error: {e}")
-                continue
-        
-        filtered.sort(key=lambda tx: int(tx["timeStamp"]))
-        return filtered
+        timeline = transactions if isinstance(transactions, TransferTimeline) else TransferTimeline(transactions)
+        return timeline.window(start_timestamp, end_timestamp)
     
-    def group_transactions_by_wallet(self, transactions: List[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
+    def group_transactions_by_wallet(self, transactions: Sequence[Transfer]) -> Dict[str, List[Transfer]]:
         
         wallet_transactions = {}
         
         for tx in transactions:
-            try:
-                wallet_from = tx["from"].lower()
-                wallet_to = tx["to"].lower()
-                
-                if wallet_from not in wallet_transactions:
-                    wallet_transactions[wallet_from] = []
-                if wallet_to not in wallet_transactions:
-                    wallet_transactions[wallet_to] = []
-                    
-                wallet_transactions[wallet_from].append(tx)
-                wallet_transactions[wallet_to].append(tx)
+            if tx.sender not in wallet_transactions:
+                wallet_transactions[tx.sender] = []
+            if tx.recipient not in wallet_transactions:
+                wallet_transactions[tx.recipient] = []
                 
-            except KeyError as e:
-                logging.warning(f"Skipping transaction with missing fields: {tx}, error: {e}")
-                continue
+            wallet_transactions[tx.sender].append(tx)
+            wallet_transactions[tx.recipient].append(tx)
         
         return wallet_transactions
     
-    def find_candidate_wallets(self, transactions: List[Dict[str, Any]], 
-                             purchase_start: int, purchase_end: int) -> List[str]:
+    def find_candidate_wallets(self, transactions: Sequence[Transfer], 
+                             purchase_start: int, purchase_end: int,
+                             known_addresses: Optional[KnownAddressIndex] = None) -> List[str]:
         
         candidate_wallets = []
         seen = set()
+        known = known_addresses if known_addresses is not None else KnownAddressIndex()
 
-        for tx in transactions:
-            try:
-                tx_timestamp = int(tx["timeStamp"])
-                wallet_to = tx["to"].lower()
-
-                if (purchase_start <= tx_timestamp <= purchase_end and
-                    wallet_to not in seen):
-                    seen.add(wallet_to)
-                    candidate_wallets.append(wallet_to)
-                    
-            except (ValueError, KeyError) as e:
-                logging.warning(f"Skipping candidate transaction: {tx}, error: {e}")
-                continue
+        for tx in self.filter_transactions_by_timerange(transactions, purchase_start, purchase_end):
+            if tx.recipient not in seen and tx.recipient not in known:
+                seen.add(tx.recipient)
+                candidate_wallets.append(tx.recipient)
         
-        return candidate_wallets
\ No newline at end of file
+        return candidate_wallets
@@ -0,0 +1,122 @@
+import logging
+from collections import Counter, deque
+from typing import Deque, List, Optional, Tuple
+
+from .transfer import Transfer
+from shared.constants.api_constants import ApiConstants
+
+BlockRange = Tuple[int, int]
+
+class AdaptiveChunkPlanner:
+
+    def __init__(self, startblock: int, endblock: int, initial_size: Optional[int] = None,
+                 lag: Optional[int] = None):
+        self.endblock = endblock
+        self.next_start = startblock
+        self.initial_size = initial_size or ApiConstants.BLOCK_CHUNK_SIZE
+        self.chunk_size = self.initial_size
+        self.lag = max(1, lag or ApiConstants.CHUNK_FETCH_CONCURRENCY)
+        self.density: Optional[float] = None
+        self.saturated_count = 0
+        self._issued_ends: List[int] = []
+        self._sizes: List[int] = []
+        self._pending: Deque[BlockRange] = deque()
+
+    def has_work(self) -> bool:
+
+        return bool(self._pending) or self.next_start <= self.endblock
+
+    def next_chunk(self) -> Optional[BlockRange]:
+
+        if self._pending:
+            return self._pending.popleft()
+
+        if self.next_start > self.endblock:
+            return None
+
+        index = len(self._issued_ends)
+        if index == 0:
+            size = self.initial_size
+        else:
+            basis = max(0, index - self.lag)
+            if basis >= len(self._sizes):
+                return None
+            size = self._sizes[basis]
+
+        chunk_end = min(self.next_start + size - 1, self.endblock)
+        chunk = (self.next_start, chunk_end)
+        self.next_start = chunk_end + 1
+        self._issued_ends.append(chunk_end)
+        return chunk
+
+    def split(self, chunk: BlockRange, result_count: int) -> bool:
+
+        chunk_start, chunk_end = chunk
+        blocks = chunk_end - chunk_start + 1
+
+        if result_count < ApiConstants.ETHERSCAN_MAX_RESULTS:
+            return False
+
+        if blocks > 1:
+            middle = chunk_start + blocks // 2
+            self._pending.extend([(chunk_start, middle - 1), (middle, chunk_end)])
+            self.saturated_count += 1
+            return True
+
+        logging.warning(f"Block {chunk_start} alone holds {result_count} transfers, results may be truncated")
+        return False
+
+    def observe(self, chunk: BlockRange, result_count: int) -> None:
+
+        chunk_start, chunk_end = chunk
+        self._update_density(result_count / (chunk_end - chunk_start + 1))
+
+        while len(self._sizes) < len(self._issued_ends) and self._issued_ends[len(self._sizes)] <= chunk_end:
+            self._sizes.append(self.chunk_size)
+
+    def _update_density(self, observed: float) -> None:
+
+        if self.density is None:
+            self.density = observed
+        else:
+            self.density = (1 - ApiConstants.CHUNK_DENSITY_SMOOTHING) * self.density + \
+                ApiConstants.CHUNK_DENSITY_SMOOTHING * observed
+
+        target_size = ApiConstants.CHUNK_TARGET_RESULTS / max(self.density, 1e-9)
+        self.chunk_size = int(min(max(target_size, ApiConstants.BLOCK_CHUNK_MIN_SIZE), ApiConstants.BLOCK_CHUNK_MAX_SIZE))
+
+class SeamDeduplicator:
+
+    def __init__(self):
+        self.duplicates = 0
+        self._block = -1
+        self._tail: Counter = Counter()
+
+    @staticmethod
+    def _key(tx: Transfer) -> Tuple[str, int, str, str, int]:
+
+        return (tx.hash, tx.log_index, tx.sender, tx.recipient, tx.value)
+
+    def filter(self, transfers: List[Transfer]) -> List[Transfer]:
+
+        unmatched = Counter(self._tail)
+        accepted = []
+
+        for tx in transfers:
+            if tx.block == self._block:
+                key = self._key(tx)
+                if unmatched[key] > 0:
+                    unmatched[key] -= 1
+                    self.duplicates += 1
+                    continue
+            accepted.append(tx)
+
+        if accepted and accepted[-1].block >= self._block:
+            last_block = accepted[-1].block
+            tail = Counter(self._key(tx) for tx in accepted if tx.block == last_block)
+            if last_block == self._block:
+                tail.update(self._tail)
+            self._block = last_block
+            self._tail = tail
+
+        return accepted
@@ -0,0 +1,133 @@
+from decimal import Decimal
+from typing import Any, Dict, List, Sequence, Tuple
+
+from .transfer import Transfer
+
+class ColumnarEngine:
+
+    LIMB_BITS = 16
+    VALUE_BYTES = 32
+
+    def __init__(self, transfers: Sequence[Transfer]):
+        import numpy
+        self._np = numpy
+
+        decimals = {tx.decimals for tx in transfers}
+        if len(decimals) > 1:
+            raise ValueError(f"Transfers mix token decimals: {sorted(decimals)}")
+        self.decimals = decimals.pop() if decimals else 0
+
+        self.wallet_ids: Dict[str, int] = {}
+        wallet_ids = self.wallet_ids
+        count = len(transfers)
+        self.sender_ids = numpy.fromiter((wallet_ids.setdefault(tx.sender, len(wallet_ids)) for tx in transfers),
+                                         dtype=numpy.int64, count=count)
+        self.recipient_ids = numpy.fromiter((wallet_ids.setdefault(tx.recipient, len(wallet_ids)) for tx in transfers),
+                                            dtype=numpy.int64, count=count)
+        self.timestamps = numpy.fromiter((tx.timestamp for tx in transfers), dtype=numpy.int64, count=count)
+
+        raw_values = b"".join([tx.value.to_bytes(self.VALUE_BYTES, "little") for tx in transfers])
+        limbs = numpy.frombuffer(raw_values, dtype="<u2").reshape(count, self.VALUE_BYTES // 2)
+        nonzero_limbs = numpy.flatnonzero(limbs.any(axis=0))
+        used_limbs = int(nonzero_limbs[-1]) + 1 if len(nonzero_limbs) else 1
+        self.value_limbs = limbs[:, :used_limbs].astype(numpy.float64)
+
+    def _candidate_mask(self, wallets: Sequence[str]) -> Any:
+
+        mask = self._np.zeros(len(self.wallet_ids), dtype=bool)
+        mask[[self.wallet_ids[wallet] for wallet in wallets if wallet in self.wallet_ids]] = True
+        return mask
+
+    def _group_sums(self, ids: Any, rows: Any, weights: Any) -> Any:
+
+        np = self._np
+        selected_ids = ids[rows]
+        selected_weights = weights[rows]
+        sums = np.empty((len(self.wallet_ids), self.value_limbs.shape[1]), dtype=np.int64)
+
+        for position in range(self.value_limbs.shape[1]):
+            sums[:, position] = np.bincount(
+                selected_ids,
+                weights=self.value_limbs[rows, position] * selected_weights,
+                minlength=len(self.wallet_ids)
+            ).astype(np.int64)
+        return sums
+
+    def _limbs_to_ints(self, limb_sums: Any) -> List[int]:
+
+        np = self._np
+        carried = np.zeros((limb_sums.shape[0], limb_sums.shape[1] + 4), dtype=np.int64)
+        carried[:, :limb_sums.shape[1]] = limb_sums
+        mask = (1 << self.LIMB_BITS) - 1
+
+        for position in range(carried.shape[1] - 1):
+            carried[:, position + 1] += carried[:, position] >> self.LIMB_BITS
+            carried[:, position] &= mask
+
+        raw = carried.astype("<u2").tobytes()
+        width = carried.shape[1] * 2
+        return [int.from_bytes(raw[offset:offset + width], "little") for offset in range(0, len(raw), width)]
+
+    def simulate_balances(self, wallets: Sequence[str], t1_unix: int, t2_unix: int,
+                          t3_unix: int) -> Dict[str, Tuple[Decimal, Decimal, int, int]]:
+
+        np = self._np
+        candidates = self._candidate_mask(wallets)
+        in_window = (self.timestamps >= t1_unix) & (self.timestamps <= t3_unix)
+        self_transfers = self.sender_ids == self.recipient_ids
+
+        received_rows = in_window & candidates[self.recipient_ids]
+        received_weights = 1 + self_transfers.astype(np.int64)
+        purchase_weights = received_weights * (self.timestamps <= t2_unix)
+        sent_rows = in_window & candidates[self.sender_ids] & ~self_transfers
+        sent_weights = np.ones(len(self.timestamps), dtype=np.int64)
+
+        known_wallets = [wallet for wallet in wallets if wallet in self.wallet_ids]
+        known_ids = np.array([self.wallet_ids[wallet] for wallet in known_wallets], dtype=np.int64)
+
+        received = self._limbs_to_ints(self._group_sums(self.recipient_ids, received_rows, received_weights)[known_ids])
+        purchased = self._limbs_to_ints(self._group_sums(self.recipient_ids, received_rows, purchase_weights)[known_ids])
+        sent = self._limbs_to_ints(self._group_sums(self.sender_ids, sent_rows, sent_weights)[known_ids])
+        purchase_counts = np.bincount(self.recipient_ids[received_rows], weights=purchase_weights[received_rows],
+                                      minlength=len(self.wallet_ids)).astype(np.int64)[known_ids].tolist()
+        sale_counts = np.bincount(self.sender_ids[sent_rows], minlength=len(self.wallet_ids))[known_ids].tolist()
+
+        scale = Decimal(10 ** self.decimals)
+        results = {wallet: (Decimal("0"), Decimal("0"), 0, 0) for wallet in wallets}
+        for index, wallet in enumerate(known_wallets):
+            results[wallet] = (
+                round(Decimal(purchased[index]) / scale, 2),
+                round(Decimal(received[index] - sent[index]) / scale, 2),
+                purchase_counts[index],
+                sale_counts[index]
+            )
+        return results
+
+    def token_frequency_passes(self, wallets: Sequence[str], interval_seconds: int, min_violations: int,
+                               min_transaction_count: int, last_transactions: int = 10) -> Dict[str, bool]:
+
+        np = self._np
+        candidates = self._candidate_mask(wallets)
+        member_ids = np.concatenate([self.sender_ids, self.recipient_ids])
+        member_timestamps = np.concatenate([self.timestamps, self.timestamps])
+        keep = candidates[member_ids]
+        member_ids, member_timestamps = member_ids[keep], member_timestamps[keep]
+
+        order = np.lexsort((-member_timestamps, member_ids))
+        member_ids, member_timestamps = member_ids[order], member_timestamps[order]
+        counts = np.bincount(member_ids, minlength=len(self.wallet_ids))
+
+        group_starts = np.r_[0, np.cumsum(counts)[:-1]]
+        ranks = np.arange(len(member_ids)) - group_starts[member_ids]
+        recent = ranks < last_transactions
+        member_ids, member_timestamps = member_ids[recent], member_timestamps[recent]
+
+        same_wallet = member_ids[:-1] == member_ids[1:]
+        rapid = same_wallet & ((member_timestamps[:-1] - member_timestamps[1:]) < interval_seconds)
+        violations = np.bincount(member_ids[:-1][rapid], minlength=len(self.wallet_ids))
+        passes = (counts < min_transaction_count) | (violations < min_violations)
+
+        return {
+            wallet: wallet not in self.wallet_ids or bool(passes[self.wallet_ids[wallet]])
+            for wallet in wallets
+        }
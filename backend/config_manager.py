@@ -56,6 +56,8 @@ class ConfigManager:
             "wallets_folder": os.path.join(self.base_dir, FileConstants.FOLDER_WALLETS),
             "cache_folder": os.path.join(self.base_dir, FileConstants.FOLDER_CACHE),
             "logs_folder": os.path.join(self.base_dir, FileConstants.FOLDER_LOGS),
-            "cache_file": os.path.join(self.base_dir, FileConstants.FOLDER_CACHE, FileConstants.FILE_WALLET_CACHE),
+            "verdict_cache_file": os.path.join(self.base_dir, FileConstants.FOLDER_CACHE, FileConstants.FILE_VERDICT_CACHE),
+            "response_cache_file": os.path.join(self.base_dir, FileConstants.FOLDER_CACHE, FileConstants.FILE_RESPONSE_CACHE),
+            "cassette_file": os.path.join(self.base_dir, FileConstants.FOLDER_CACHE, FileConstants.FILE_HTTP_CASSETTE),
             "log_file": os.path.join(self.base_dir, FileConstants.FOLDER_LOGS, FileConstants.FILE_ERROR_LOG)
         }
\ No newline at end of file
@@ -24,6 +24,9 @@ class ExchangeRateService:
 
         return pairs
 
+    def get_pairs(self, token_address: str, retries: Optional[int] = None) -> List[Dict[str, Any]]:
+        return self._fetch_pairs(token_address, retries) or []
+
     def get_exchange_rate(self, token_address: str, retries: Optional[int] = None) -> Optional[float]:
         pairs = self._fetch_pairs(token_address, retries)
         if pairs is None:
@@ -0,0 +1,37 @@
+import asyncio
+from operator import attrgetter
+from typing import Awaitable, Callable, Iterable, List, Tuple
+
+class WalletFilter:
+
+    CACHE = 0
+    LOCAL = 1
+    NETWORK = 10
+
+    def __init__(self, name: str, cost: int, apply: Callable[[List[str]], Awaitable[List[str]]]):
+        self.name = name
+        self.cost = cost
+        self.apply = apply
+
+class FilterChain:
+
+    def __init__(self, filters: Iterable[WalletFilter]):
+        self.filters = sorted(filters, key=attrgetter("cost"))
+        self.stats: List[Tuple[str, int, int]] = []
+
+    async def run_async(self, wallets: List[str]) -> List[str]:
+
+        self.stats = []
+
+        for wallet_filter in self.filters:
+            if not wallets:
+                break
+            passed = await wallet_filter.apply(wallets)
+            self.stats.append((wallet_filter.name, len(wallets), len(passed)))
+            wallets = passed
+
+        return wallets
+
+    def run(self, wallets: List[str]) -> List[str]:
+
+        return asyncio.run(self.run_async(wallets))
@@ -0,0 +1,101 @@
+import gzip
+import logging
+import os
+import threading
+from collections import defaultdict, deque
+from typing import Any, Deque, Dict, Optional, TextIO
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from .response_cache import ResponseCache
+from shared.json_codec import JsonCodec
+
+class CassetteMissError(LookupError):
+    pass
+
+class HttpCassette:
+
+    RECORD = "record"
+    REPLAY = "replay"
+    RECORDED_HEADERS = ("Content-Type", "Retry-After")
+
+    def __init__(self, path: str, mode: str):
+        if mode not in (self.RECORD, self.REPLAY):
+            raise ValueError(f"Unsupported cassette mode: {mode}")
+
+        self.path = path
+        self.mode = mode
+        self._stream: Optional[TextIO] = None
+        self._interactions: Dict[str, Deque[Dict[str, Any]]] = defaultdict(deque)
+        self._lock = threading.Lock()
+
+        if mode == self.REPLAY:
+            self._load()
+        else:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            self._stream = gzip.open(self.path, "wt", encoding="utf-8")
+
+    @property
+    def is_replaying(self) -> bool:
+        return self.mode == self.REPLAY
+
+    def _load(self) -> None:
+
+        with gzip.open(self.path, "rt", encoding="utf-8") as f:
+            try:
+                for line in f:
+                    interaction = JsonCodec.loads(line)
+                    self._interactions[interaction["key"]].append(interaction)
+            except (EOFError, ValueError) as e:
+                logging.warning(f"HTTP cassette {self.path} ends early, replaying what was recorded: {e}")
+
+    def record(self, url: str, params: Dict[str, Any], response: requests.Response) -> None:
+
+        interaction = {
+            "key": ResponseCache.make_key(url, params),
+            "url": url,
+            "params": {name: value for name, value in params.items() if name not in ResponseCache.IGNORED_PARAMS},
+            "status": response.status_code,
+            "headers": {name: response.headers[name] for name in self.RECORDED_HEADERS if name in response.headers},
+            "body": response.text
+        }
+
+        with self._lock:
+            if self._stream is None:
+                return
+            try:
+                self._stream.write(JsonCodec.dumps(interaction) + "\n")
+                self._stream.flush()
+            except Exception as e:
+                logging.error(f"Error writing HTTP cassette {self.path}: {e}")
+
+    def replay(self, url: str, params: Dict[str, Any]) -> requests.Response:
+
+        key = ResponseCache.make_key(url, params)
+
+        with self._lock:
+            queue = self._interactions.get(key)
+            if not queue:
+                raise CassetteMissError(f"No recorded response for {url} {params}")
+            interaction = queue.popleft() if len(queue) > 1 else queue[0]
+
+        response = requests.Response()
+        response.status_code = interaction["status"]
+        response.headers = CaseInsensitiveDict(interaction["headers"])
+        response.encoding = "utf-8"
+        response.url = url
+        response._content = interaction["body"].encode("utf-8")
+        return response
+
+    def save(self) -> None:
+
+        with self._lock:
+            if self._stream is None:
+                return
+            try:
+                self._stream.close()
+            except Exception as e:
+                logging.error(f"Error saving HTTP cassette {self.path}: {e}")
+            finally:
+                self._stream = None
@@ -0,0 +1,58 @@
+import threading
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from shared.constants.api_constants import ApiConstants
+
+class HttpSessionPool:
+
+    def __init__(self, pool_connections: Optional[int] = None, pool_maxsize: Optional[int] = None):
+        self.pool_connections = pool_connections or ApiConstants.HTTP_POOL_CONNECTIONS
+        self.pool_maxsize = pool_maxsize or ApiConstants.HTTP_POOL_MAXSIZE
+        self._sessions: Dict[str, requests.Session] = {}
+        self._lock = threading.Lock()
+
+    def _create_session(self) -> requests.Session:
+
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=self.pool_connections,
+            pool_maxsize=self.pool_maxsize,
+            pool_block=True
+        )
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        session.headers.update({
+            "Accept-Encoding": ApiConstants.HTTP_ACCEPT_ENCODING,
+            "Connection": "keep-alive"
+        })
+        return session
+
+    def get_session(self, url: str) -> requests.Session:
+
+        host = urlsplit(url).netloc.lower()
+
+        session = self._sessions.get(host)
+        if session is not None:
+            return session
+
+        with self._lock:
+            session = self._sessions.get(host)
+            if session is None:
+                session = self._create_session()
+                self._sessions[host] = session
+            return session
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+
+        return self.get_session(url).get(url, **kwargs)
+
+    def close(self) -> None:
+
+        with self._lock:
+            for session in self._sessions.values():
+                session.close()
+            self._sessions.clear()
@@ -0,0 +1,75 @@
+import json
+import re
+from typing import Any, Callable, Iterator
+
+_DECODER = json.JSONDecoder()
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+def _skip_whitespace(payload: str, index: int) -> int:
+
+    match = _WHITESPACE.match(payload, index)
+    return match.end() if match else index
+
+def _expect(payload: str, index: int, char: str) -> int:
+
+    index = _skip_whitespace(payload, index)
+    if payload[index:index + 1] != char:
+        raise json.JSONDecodeError(f"Expecting '{char}'", payload, index)
+    return index + 1
+
+class StreamedJsonArray:
+
+    def __init__(self, payload: str, start: int):
+        self.payload = payload
+        self.start = start
+
+    def __iter__(self) -> Iterator[Any]:
+
+        payload = self.payload
+        index = _expect(payload, self.start, "[")
+        index = _skip_whitespace(payload, index)
+
+        if payload[index:index + 1] == "]":
+            return
+
+        while True:
+            item, index = _DECODER.raw_decode(payload, index)
+            yield item
+
+            index = _skip_whitespace(payload, index)
+            if payload[index:index + 1] == "]":
+                return
+            index = _skip_whitespace(payload, _expect(payload, index, ","))
+
+class StreamedJsonObject(dict):
+
+    def __init__(self, payload: str, streamed_field: str):
+        super().__init__()
+        self.streamed_field = streamed_field
+        self._parse(payload)
+
+    def _parse(self, payload: str) -> None:
+
+        index = _expect(payload, 0, "{")
+
+        while True:
+            index = _skip_whitespace(payload, index)
+            if payload[index:index + 1] == "}":
+                return
+
+            key, index = _DECODER.raw_decode(payload, index)
+            index = _skip_whitespace(payload, _expect(payload, index, ":"))
+
+            if key == self.streamed_field and payload[index:index + 1] == "[":
+                self[key] = StreamedJsonArray(payload, index)
+                return
+
+            self[key], index = _DECODER.raw_decode(payload, index)
+            index = _skip_whitespace(payload, index)
+            if payload[index:index + 1] == ",":
+                index += 1
+
+    @classmethod
+    def decoder(cls, streamed_field: str) -> Callable[[str], "StreamedJsonObject"]:
+
+        return lambda payload: cls(payload, streamed_field)
@@ -0,0 +1,94 @@
+import hashlib
+import logging
+import math
+import os
+from typing import Any, Dict, Iterable, Iterator, Optional
+
+from shared.constants.api_constants import ApiConstants
+from shared.json_codec import JsonCodec
+
+class BloomFilter:
+
+    def __init__(self, capacity: int, error_rate: float):
+        capacity = max(capacity, 1)
+        self.size = max(8, int(math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)))
+        self.hash_count = max(1, int(round(self.size / capacity * math.log(2))))
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item: str) -> Iterator[int]:
+
+        digest = hashlib.blake2b(item.encode("utf-8"), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        step = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.hash_count):
+            yield (first + i * step) % self.size
+
+    def add(self, item: str) -> None:
+
+        for position in self._positions(item):
+            self._bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, item: str) -> bool:
+
+        return all(self._bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+class KnownAddressIndex:
+
+    ALL_NETWORKS = "ALL"
+
+    def __init__(self, labels: Optional[Dict[str, str]] = None, bloom_min_entries: Optional[int] = None):
+        self.bloom_min_entries = bloom_min_entries or ApiConstants.KNOWN_ADDRESS_BLOOM_MIN_ENTRIES
+        self._labels: Dict[str, str] = {}
+        self._bloom: Optional[BloomFilter] = None
+        self._bloom_count = 0
+
+        labels = labels or {}
+        if len(labels) >= self.bloom_min_entries:
+            self._bloom = BloomFilter(len(labels), ApiConstants.KNOWN_ADDRESS_BLOOM_ERROR_RATE)
+            for address in labels:
+                self._bloom.add(address.lower())
+            self._bloom_count = len(labels)
+        else:
+            for address, label in labels.items():
+                self.add(address, label)
+
+    def __len__(self) -> int:
+        return len(self._labels) + self._bloom_count
+
+    def __contains__(self, address: str) -> bool:
+        return address in self._labels or (self._bloom is not None and address in self._bloom)
+
+    @classmethod
+    def load(cls, file_path: str, network: str) -> "KnownAddressIndex":
+
+        labels: Dict[str, str] = {}
+
+        try:
+            if os.path.exists(file_path):
+                data = JsonCodec.load_file(file_path)
+                for section in (cls.ALL_NETWORKS, network.upper()):
+                    labels.update(data.get(section, {}))
+        except Exception as e:
+            logging.error(f"Error loading known addresses {file_path}: {e}")
+
+        return cls(labels)
+
+    def add(self, address: str, label: str) -> None:
+
+        self._labels[address.lower()] = label
+
+    def add_pairs(self, pairs: Iterable[Dict[str, Any]]) -> None:
+
+        for pair in pairs:
+            pair_address = pair.get("pairAddress")
+            if pair_address:
+                self.add(pair_address, f"{pair.get('dexId', 'DEX')} pair")
+
+    def label(self, address: str) -> Optional[str]:
+
+        address = address.lower()
+        if address in self._labels:
+            return self._labels[address]
+        if self._bloom is not None and address in self._bloom:
+            return "known address"
+        return None
@@ -0,0 +1,97 @@
+import threading
+import time
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+from shared.constants.api_constants import ApiConstants
+
+class TokenBucket:
+
+    def __init__(self, rate: float, burst: float):
+        self.max_rate = rate
+        self.min_rate = rate * ApiConstants.RATE_LIMIT_MIN_FRACTION
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.throttle_count = 0
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+
+        self.tokens = min(self.burst, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def try_acquire(self) -> float:
+
+        with self._lock:
+            self._refill(time.monotonic())
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return 0.0
+            return (1 - self.tokens) / self.rate
+
+    def acquire(self) -> float:
+
+        waited = 0.0
+        while True:
+            wait_time = self.try_acquire()
+            if wait_time == 0.0:
+                return waited
+            time.sleep(wait_time)
+            waited += wait_time
+
+    def available(self) -> float:
+
+        with self._lock:
+            self._refill(time.monotonic())
+            return self.tokens
+
+    def on_success(self) -> None:
+
+        with self._lock:
+            self.rate = min(self.max_rate, self.rate + ApiConstants.RATE_LIMIT_ADDITIVE_INCREASE)
+
+    def on_throttle(self) -> None:
+
+        with self._lock:
+            self._refill(time.monotonic())
+            self.rate = max(self.min_rate, self.rate * ApiConstants.RATE_LIMIT_DECREASE_FACTOR)
+            self.tokens = min(self.tokens, 0.0)
+            self.throttle_count += 1
+
+class RateLimiter:
+
+    def __init__(self, limits: Optional[Dict[str, Tuple[float, float]]] = None):
+        self.limits = limits if limits is not None else ApiConstants.RATE_LIMITS
+        self._buckets: Dict[Tuple[str, str], TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def get_bucket(self, url: str, api_key: Optional[str] = None) -> TokenBucket:
+
+        host = urlsplit(url).netloc.lower()
+        bucket_key = (host, api_key or "")
+
+        bucket = self._buckets.get(bucket_key)
+        if bucket is not None:
+            return bucket
+
+        with self._lock:
+            bucket = self._buckets.get(bucket_key)
+            if bucket is None:
+                rate, burst = self.limits.get(host, ApiConstants.DEFAULT_RATE_LIMIT)
+                bucket = TokenBucket(rate, burst)
+                self._buckets[bucket_key] = bucket
+            return bucket
+
+    def acquire(self, url: str, api_key: Optional[str] = None) -> float:
+
+        return self.get_bucket(url, api_key).acquire()
+
+    def on_success(self, url: str, api_key: Optional[str] = None) -> None:
+
+        self.get_bucket(url, api_key).on_success()
+
+    def on_throttle(self, url: str, api_key: Optional[str] = None) -> None:
+
+        self.get_bucket(url, api_key).on_throttle()
@@ -0,0 +1,126 @@
+import hashlib
+import json
+import math
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from shared.constants.api_constants import ApiConstants
+
+class ResponseCache:
+
+    NO_EXPIRY = math.inf
+    IGNORED_PARAMS = ("apikey",)
+    IN_MEMORY = ":memory:"
+
+    def __init__(self, db_path: str, max_bytes: Optional[int] = None, bypass: bool = False,
+                 disabled: bool = False):
+        self.db_path = self.IN_MEMORY if disabled else db_path
+        self.max_bytes = max_bytes if max_bytes is not None else ApiConstants.RESPONSE_CACHE_MAX_BYTES
+        self.bypass = bypass
+        self.disabled = disabled
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        if self.db_path != self.IN_MEMORY:
+            os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+        self._connection = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, body TEXT NOT NULL, size INTEGER NOT NULL, "
+            "created REAL NOT NULL, expires REAL, accessed REAL NOT NULL)"
+        )
+        self._connection.execute("CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed)")
+        self._connection.commit()
+        self._total_bytes = self._connection.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+
+    @classmethod
+    def make_key(cls, url: str, params: Dict[str, Any]) -> str:
+
+        normalized = {
+            str(name): str(value)
+            for name, value in params.items()
+            if name not in cls.IGNORED_PARAMS
+        }
+        content = json.dumps({"url": url, "params": normalized}, sort_keys=True, separators=(",", ":"))
+        return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+
+        if self.bypass or self.disabled:
+            return None
+
+        now = time.time()
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT body, expires FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+
+            if row is None or (row[1] is not None and row[1] < now):
+                self.misses += 1
+                return None
+
+            self._connection.execute("UPDATE responses SET accessed = ? WHERE key = ?", (now, key))
+            self._connection.commit()
+            self.hits += 1
+            return row[0]
+
+    def put(self, key: str, body: str, ttl: float = NO_EXPIRY) -> None:
+
+        if self.disabled:
+            return
+
+        now = time.time()
+        expires = None if ttl == self.NO_EXPIRY else now + ttl
+        size = len(body)
+
+        with self._lock:
+            previous = self._connection.execute("SELECT size FROM responses WHERE key = ?", (key,)).fetchone()
+            self._connection.execute(
+                "INSERT OR REPLACE INTO responses (key, body, size, created, expires, accessed) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, body, size, now, expires, now)
+            )
+            self._total_bytes += size - (previous[0] if previous else 0)
+            self._evict()
+            self._connection.commit()
+
+    def delete(self, key: str) -> None:
+
+        if self.disabled:
+            return
+
+        with self._lock:
+            previous = self._connection.execute("SELECT size FROM responses WHERE key = ?", (key,)).fetchone()
+            if previous is None:
+                return
+            self._connection.execute("DELETE FROM responses WHERE key = ?", (key,))
+            self._total_bytes -= previous[0]
+            self._connection.commit()
+
+    def _evict(self) -> None:
+
+        if self._total_bytes <= self.max_bytes:
+            return
+
+        self._connection.execute("DELETE FROM responses WHERE expires IS NOT NULL AND expires < ?", (time.time(),))
+        self._total_bytes = self._connection.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+
+        rows = self._connection.execute("SELECT key, size FROM responses ORDER BY accessed ASC")
+        stale_keys = []
+        for key, size in rows:
+            if self._total_bytes <= self.max_bytes:
+                break
+            stale_keys.append((key,))
+            self._total_bytes -= size
+
+        self._connection.executemany("DELETE FROM responses WHERE key = ?", stale_keys)
+
+    def close(self) -> None:
+
+        with self._lock:
+            self._connection.close()
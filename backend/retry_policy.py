@@ -0,0 +1,130 @@
+import random
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+import requests
+
+from shared.constants.api_constants import ApiConstants
+
+class CircuitBreaker:
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half-open"
+
+    def __init__(self, failure_threshold: int, reset_seconds: float):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._lock = threading.Lock()
+
+    def allow_request(self) -> bool:
+
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            now = time.monotonic()
+            if self.state == self.OPEN and now - self.opened_at >= self.reset_seconds:
+                self.state = self.HALF_OPEN
+                self.opened_at = now
+                return True
+            if self.state == self.HALF_OPEN and now - self.opened_at >= self.reset_seconds:
+                self.opened_at = now
+                return True
+            return False
+
+    def seconds_until_probe(self) -> float:
+
+        with self._lock:
+            if self.state == self.CLOSED:
+                return 0.0
+            return max(0.0, self.reset_seconds - (time.monotonic() - self.opened_at))
+
+    def record_success(self) -> None:
+
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+
+    def record_failure(self) -> None:
+
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+
+class RetryPolicy:
+
+    def __init__(self, base_delay: Optional[float] = None, max_delay: Optional[float] = None):
+        self.base_delay = base_delay if base_delay is not None else ApiConstants.RETRY_BASE_DELAY
+        self.max_delay = max_delay if max_delay is not None else ApiConstants.RETRY_MAX_DELAY
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._retries: Dict[str, int] = defaultdict(int)
+        self._waited: Dict[str, float] = defaultdict(float)
+        self._lock = threading.Lock()
+
+    def breaker(self, url: str) -> CircuitBreaker:
+
+        host = urlsplit(url).netloc.lower()
+        with self._lock:
+            breaker = self._breakers.get(host)
+            if breaker is None:
+                breaker = CircuitBreaker(ApiConstants.CIRCUIT_FAILURE_THRESHOLD, ApiConstants.CIRCUIT_RESET_SECONDS)
+                self._breakers[host] = breaker
+            return breaker
+
+    @staticmethod
+    def parse_retry_after(response: Optional[requests.Response]) -> Optional[float]:
+
+        if response is None:
+            return None
+
+        value = response.headers.get("Retry-After")
+        if not value:
+            return None
+
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+
+        try:
+            retry_at = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        if retry_at.tzinfo is None:
+            retry_at = retry_at.replace(tzinfo=timezone.utc)
+        return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+    def delay_for(self, attempt: int, response: Optional[requests.Response] = None, throttled: bool = False) -> float:
+
+        retry_after = self.parse_retry_after(response)
+        if retry_after is not None:
+            return min(retry_after, self.max_delay)
+
+        if throttled:
+            return 0.0
+
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+
+    def record_retry(self, endpoint: str, delay: float) -> None:
+
+        with self._lock:
+            self._retries[endpoint] += 1
+            self._waited[endpoint] += delay
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+
+        with self._lock:
+            return {
+                endpoint: {"retries": count, "waited_seconds": round(self._waited[endpoint], 2)}
+                for endpoint, count in sorted(self._retries.items())
+            }
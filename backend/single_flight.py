@@ -0,0 +1,47 @@
+import copy
+import threading
+from typing import Any, Callable, Dict, Optional, TypeVar
+
+T = TypeVar("T")
+
+class _InFlightCall:
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+class SingleFlight:
+
+    def __init__(self):
+        self.shared_count = 0
+        self._calls: Dict[str, _InFlightCall] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: str, func: Callable[[], T]) -> T:
+
+        with self._lock:
+            call = self._calls.get(key)
+            is_leader = call is None
+            if call is None:
+                call = _InFlightCall()
+                self._calls[key] = call
+            else:
+                self.shared_count += 1
+
+        if not is_leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return copy.deepcopy(call.result)
+
+        try:
+            call.result = func()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
@@ -0,0 +1,94 @@
+import sys
+from array import array
+from bisect import bisect_left, bisect_right
+from collections.abc import Sequence
+from operator import attrgetter
+from typing import Any, Dict, Iterable, Iterator, Optional, Tuple
+
+class Transfer:
+
+    __slots__ = ("block", "timestamp", "log_index", "hash", "sender", "recipient", "value", "decimals")
+
+    def __init__(self, block: int, timestamp: int, log_index: int, tx_hash: str,
+                 sender: str, recipient: str, value: int, decimals: int):
+        self.block = block
+        self.timestamp = timestamp
+        self.log_index = log_index
+        self.hash = tx_hash
+        self.sender = sender
+        self.recipient = recipient
+        self.value = value
+        self.decimals = decimals
+
+    @classmethod
+    def from_api(cls, tx: Dict[str, Any]) -> "Transfer":
+
+        return cls(
+            int(tx.get("blockNumber") or 0),
+            int(tx["timeStamp"]),
+            int(tx.get("logIndex") or 0),
+            tx.get("hash", ""),
+            sys.intern(tx["from"].lower()),
+            sys.intern(tx["to"].lower()),
+            int(tx["value"]),
+            int(tx.get("tokenDecimal") or 0)
+        )
+
+    def as_tuple(self) -> Tuple[int, int, int, str, str, str, int, int]:
+
+        return (self.block, self.timestamp, self.log_index, self.hash,
+                self.sender, self.recipient, self.value, self.decimals)
+
+    def __eq__(self, other: object) -> bool:
+
+        return isinstance(other, Transfer) and self.as_tuple() == other.as_tuple()
+
+    def __repr__(self) -> str:
+
+        return (f"Transfer(block={self.block}, timestamp={self.timestamp}, log_index={self.log_index}, "
+                f"sender={self.sender}, recipient={self.recipient}, value={self.value})")
+
+class TransferTimeline(Sequence):
+
+    def __init__(self, transfers: Iterable[Transfer] = (), timestamps: Optional["array[int]"] = None):
+        self.transfers = list(transfers)
+        if timestamps is None:
+            self.transfers.sort(key=attrgetter("timestamp"))
+            timestamps = array("q", [tx.timestamp for tx in self.transfers])
+        self.timestamps = timestamps
+
+    def __len__(self) -> int:
+        return len(self.transfers)
+
+    def __getitem__(self, index: Any) -> Any:
+        return self.transfers[index]
+
+    def __iter__(self) -> Iterator[Transfer]:
+        return iter(self.transfers)
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, Sequence) and self.transfers == list(other)
+
+    def bounds(self, start_timestamp: int, end_timestamp: int) -> Tuple[int, int]:
+
+        return bisect_left(self.timestamps, start_timestamp), bisect_right(self.timestamps, end_timestamp)
+
+    def window(self, start_timestamp: int, end_timestamp: int) -> "TransferTimeline":
+
+        low, high = self.bounds(start_timestamp, end_timestamp)
+        if low == 0 and high == len(self.transfers):
+            return self
+        return TransferTimeline(self.transfers[low:high], self.timestamps[low:high])
+
+    def select(self, indices: Iterable[int]) -> "TransferTimeline":
+
+        transfers, timestamps = self.transfers, self.timestamps
+        selected = list(indices)
+        return TransferTimeline([transfers[index] for index in selected], array("q", [timestamps[index] for index in selected]))
+
+    def extend(self, other: "TransferTimeline") -> None:
+
+        if other.timestamps and self.timestamps and other.timestamps[0] < self.timestamps[-1]:
+            raise ValueError("Transfers must be appended in time order")
+        self.transfers.extend(other.transfers)
+        self.timestamps.extend(other.timestamps)
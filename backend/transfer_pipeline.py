@@ -0,0 +1,161 @@
+import asyncio
+from array import array
+from collections.abc import Mapping
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Set
+
+from .blockchain_analyzer import BlockchainAnalyzer
+from .known_address_index import KnownAddressIndex
+from .transfer import Transfer, TransferTimeline
+from shared.constants.api_constants import ApiConstants
+
+_END_OF_STREAM = None
+
+class WalletTransactions(Mapping):
+
+    def __init__(self, transfers: TransferTimeline, indices: Dict[str, "array[int]"]):
+        self._transfers = transfers
+        self._indices = indices
+
+    def __getitem__(self, wallet: str) -> TransferTimeline:
+        return self._transfers.select(self._indices[wallet])
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._indices)
+
+    def __len__(self) -> int:
+        return len(self._indices)
+
+class WalletActivity:
+
+    def __init__(self, purchase_start: int, purchase_end: int,
+                 known_addresses: Optional[KnownAddressIndex] = None):
+        self.purchase_start = purchase_start
+        self.purchase_end = purchase_end
+        self.known_addresses = known_addresses if known_addresses is not None else KnownAddressIndex()
+        self.excluded_wallets: Set[str] = set()
+        self.transfer_count = 0
+        self.transfers = TransferTimeline()
+        self.candidate_wallets: List[str] = []
+        self._indices: Dict[str, "array[int]"] = {}
+        self._pending: Optional[Dict[str, "array[int]"]] = {}
+        self.wallet_transactions = WalletTransactions(self.transfers, self._indices)
+
+    @property
+    def in_period_count(self) -> int:
+        return len(self.transfers)
+
+    def add_transfers(self, transfers: Sequence[Transfer]) -> None:
+
+        timeline = transfers if isinstance(transfers, TransferTimeline) else TransferTimeline(transfers)
+        offset = len(self.transfers)
+        self.transfers.extend(timeline)
+
+        indices = self._indices
+        pending = self._pending
+        known = self.known_addresses
+        purchase_start, purchase_cut = timeline.bounds(self.purchase_start, self.purchase_end)
+        index = offset
+
+        if pending is not None:
+            for position, tx in enumerate(timeline.transfers[:purchase_cut]):
+                recipient = tx.recipient
+                if position >= purchase_start and recipient not in indices:
+                    if recipient in known:
+                        self.excluded_wallets.add(recipient)
+                    else:
+                        indices[recipient] = pending.pop(recipient, None) or array("q")
+                        self.candidate_wallets.append(recipient)
+
+                for wallet in (tx.sender, recipient):
+                    wallet_indices = indices.get(wallet)
+                    if wallet_indices is None:
+                        wallet_indices = pending.get(wallet)
+                        if wallet_indices is None:
+                            wallet_indices = pending[wallet] = array("q")
+                    wallet_indices.append(index)
+
+                index += 1
+
+            if purchase_cut < len(timeline):
+                self._pending = None
+        else:
+            purchase_cut = 0
+
+        for tx in timeline.transfers[purchase_cut:]:
+            sender_indices = indices.get(tx.sender)
+            if sender_indices is not None:
+                sender_indices.append(index)
+            recipient_indices = indices.get(tx.recipient)
+            if recipient_indices is not None:
+                recipient_indices.append(index)
+            index += 1
+
+    def candidate_transfers(self) -> List[Transfer]:
+
+        involved = bytearray(len(self.transfers))
+        for wallet_indices in self._indices.values():
+            for index in wallet_indices:
+                involved[index] = 1
+        return [tx for tx, flag in zip(self.transfers, involved) if flag]
+
+class TransferPipeline:
+
+    def __init__(self, blockchain_analyzer: BlockchainAnalyzer, queue_size: Optional[int] = None,
+                 known_addresses: Optional[KnownAddressIndex] = None):
+        self.blockchain_analyzer = blockchain_analyzer
+        self.queue_size = queue_size or ApiConstants.PIPELINE_QUEUE_SIZE
+        self.known_addresses = known_addresses
+
+    async def _produce(self, output: "asyncio.Queue[Any]", activity: WalletActivity, startblock: int,
+                       endblock: int, token_contract_address: str) -> None:
+
+        try:
+            async for chunk_txs in self.blockchain_analyzer.iter_token_transactions_async(
+                startblock, endblock, token_contract_address
+            ):
+                activity.transfer_count += len(chunk_txs)
+                await output.put(chunk_txs)
+        finally:
+            await output.put(_END_OF_STREAM)
+
+    async def _filter_timerange(self, source: "asyncio.Queue[Any]", output: "asyncio.Queue[Any]",
+                                start_timestamp: int, end_timestamp: int) -> None:
+
+        try:
+            while (chunk_txs := await source.get()) is not _END_OF_STREAM:
+                in_period = self.blockchain_analyzer.filter_transactions_by_timerange(chunk_txs, start_timestamp, end_timestamp)
+                if in_period:
+                    await output.put(in_period)
+        finally:
+            await output.put(_END_OF_STREAM)
+
+    async def _aggregate(self, source: "asyncio.Queue[Any]", activity: WalletActivity) -> None:
+
+        while (chunk_txs := await source.get()) is not _END_OF_STREAM:
+            activity.add_transfers(chunk_txs)
+
+    async def run_async(self, startblock: int, endblock: int, token_contract_address: str,
+                        t1: int, t2: int, t3: int) -> WalletActivity:
+
+        activity = WalletActivity(t1, t2, self.known_addresses)
+        fetched: "asyncio.Queue[Any]" = asyncio.Queue(maxsize=self.queue_size)
+        in_period: "asyncio.Queue[Any]" = asyncio.Queue(maxsize=self.queue_size)
+
+        stages = [
+            asyncio.ensure_future(self._produce(fetched, activity, startblock, endblock, token_contract_address)),
+            asyncio.ensure_future(self._filter_timerange(fetched, in_period, t1, t3)),
+            asyncio.ensure_future(self._aggregate(in_period, activity))
+        ]
+
+        try:
+            await asyncio.gather(*stages)
+        finally:
+            for stage in stages:
+                stage.cancel()
+
+        return activity
+
+    def run(self, startblock: int, endblock: int, token_contract_address: str,
+            t1: int, t2: int, t3: int) -> WalletActivity:
+
+        return asyncio.run(self.run_async(startblock, endblock, token_contract_address, t1, t2, t3))
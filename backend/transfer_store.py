@@ -0,0 +1,132 @@
+import os
+import sqlite3
+import sys
+import threading
+from typing import Iterable, Iterator, List, Tuple
+
+from .transfer import Transfer
+
+BlockRange = Tuple[int, int]
+
+class TransferStore:
+
+    BATCH_SIZE = 5000
+    SCHEMA_VERSION = 3
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        self._connection = sqlite3.connect(db_path, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+
+        if self._connection.execute("PRAGMA user_version").fetchone()[0] != self.SCHEMA_VERSION:
+            self._connection.execute("DROP TABLE IF EXISTS transfers")
+            self._connection.execute("DROP TABLE IF EXISTS coverage")
+            self._connection.execute(f"PRAGMA user_version = {self.SCHEMA_VERSION}")
+
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS transfers ("
+            "chain_id INTEGER NOT NULL, contract TEXT NOT NULL, block INTEGER NOT NULL, position INTEGER NOT NULL, "
+            "log_index INTEGER NOT NULL, hash TEXT NOT NULL, timestamp INTEGER NOT NULL, "
+            "sender TEXT NOT NULL, recipient TEXT NOT NULL, value TEXT NOT NULL, decimals INTEGER NOT NULL, "
+            "PRIMARY KEY (chain_id, contract, block, position))"
+        )
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS coverage ("
+            "chain_id INTEGER NOT NULL, contract TEXT NOT NULL, start_block INTEGER NOT NULL, end_block INTEGER NOT NULL)"
+        )
+        self._connection.execute("CREATE INDEX IF NOT EXISTS coverage_token ON coverage (chain_id, contract)")
+        self._connection.commit()
+
+    def _coverage(self, chain_id: int, contract: str) -> List[BlockRange]:
+
+        return self._connection.execute(
+            "SELECT start_block, end_block FROM coverage WHERE chain_id = ? AND contract = ? ORDER BY start_block",
+            (chain_id, contract.lower())
+        ).fetchall()
+
+    def missing_intervals(self, chain_id: int, contract: str, startblock: int, endblock: int) -> List[BlockRange]:
+
+        missing = []
+        cursor = startblock
+
+        with self._lock:
+            covered = self._coverage(chain_id, contract)
+
+        for covered_start, covered_end in covered:
+            if cursor > endblock:
+                break
+            if covered_end < cursor:
+                continue
+            if covered_start > cursor:
+                missing.append((cursor, min(covered_start - 1, endblock)))
+            cursor = max(cursor, covered_end + 1)
+
+        if cursor <= endblock:
+            missing.append((cursor, endblock))
+        return missing
+
+    def add(self, chain_id: int, contract: str, startblock: int, endblock: int,
+            transfers: Iterable[Transfer]) -> None:
+
+        contract = contract.lower()
+        rows = []
+        block, position = -1, 0
+        for tx in transfers:
+            position = position + 1 if tx.block == block else 0
+            block = tx.block
+            rows.append((chain_id, contract, tx.block, position, tx.log_index, tx.hash, tx.timestamp,
+                         tx.sender, tx.recipient, str(tx.value), tx.decimals))
+
+        with self._lock, self._connection:
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO transfers (chain_id, contract, block, position, log_index, hash, timestamp, "
+                "sender, recipient, value, decimals) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                rows
+            )
+
+            merged = []
+            for interval in sorted(self._coverage(chain_id, contract) + [(startblock, endblock)]):
+                if merged and interval[0] <= merged[-1][1] + 1:
+                    merged[-1] = (merged[-1][0], max(merged[-1][1], interval[1]))
+                else:
+                    merged.append(interval)
+
+            self._connection.execute("DELETE FROM coverage WHERE chain_id = ? AND contract = ?", (chain_id, contract))
+            self._connection.executemany(
+                "INSERT INTO coverage (chain_id, contract, start_block, end_block) VALUES (?, ?, ?, ?)",
+                [(chain_id, contract, interval_start, interval_end) for interval_start, interval_end in merged]
+            )
+
+    def iter_load(self, chain_id: int, contract: str, startblock: int, endblock: int) -> Iterator[List[Transfer]]:
+
+        last_key = (startblock, -1)
+
+        while True:
+            with self._lock:
+                rows = self._connection.execute(
+                    "SELECT block, position, log_index, hash, timestamp, sender, recipient, value, decimals "
+                    "FROM transfers WHERE chain_id = ? AND contract = ? AND (block, position) > (?, ?) AND block <= ? "
+                    "ORDER BY block, position LIMIT ?",
+                    (chain_id, contract.lower(), last_key[0], last_key[1], endblock, self.BATCH_SIZE)
+                ).fetchall()
+
+            if not rows:
+                return
+
+            yield [
+                Transfer(block, timestamp, log_index, tx_hash, sys.intern(sender), sys.intern(recipient), int(value), decimals)
+                for block, _, log_index, tx_hash, timestamp, sender, recipient, value, decimals in rows
+            ]
+            last_key = rows[-1][:2]
+
+    def load(self, chain_id: int, contract: str, startblock: int, endblock: int) -> List[Transfer]:
+
+        return [tx for batch in self.iter_load(chain_id, contract, startblock, endblock) for tx in batch]
+
+    def close(self) -> None:
+
+        with self._lock:
+            self._connection.close()
@@ -0,0 +1,102 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from shared.constants.api_constants import ApiConstants
+
+class VerdictCache:
+
+    IN_MEMORY = ":memory:"
+
+    def __init__(self, db_path: Optional[str] = None, scope: str = "",
+                 ttl_seconds: Optional[float] = None, max_entries: Optional[int] = None,
+                 compact_every: Optional[int] = None):
+        self.db_path = db_path or self.IN_MEMORY
+        self.scope = scope
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else ApiConstants.VERDICT_CACHE_TTL_SECONDS
+        self.max_entries = max_entries or ApiConstants.VERDICT_CACHE_MAX_ENTRIES
+        self.compact_every = compact_every or ApiConstants.VERDICT_CACHE_COMPACT_EVERY
+        self.hits = 0
+        self.misses = 0
+        self._writes_since_compaction = 0
+        self._lock = threading.Lock()
+
+        if self.db_path != self.IN_MEMORY:
+            os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+        self._connection = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS verdicts ("
+            "scope TEXT NOT NULL, wallet TEXT NOT NULL, passed INTEGER NOT NULL, checked_at REAL NOT NULL, "
+            "PRIMARY KEY (scope, wallet))"
+        )
+        self._connection.execute("CREATE INDEX IF NOT EXISTS verdicts_checked_at ON verdicts (checked_at)")
+        self._connection.commit()
+
+        with self._lock:
+            self._compact()
+
+    def __len__(self) -> int:
+
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM verdicts").fetchone()[0]
+
+    @staticmethod
+    def make_scope(network: Any, params: Dict[str, Any]) -> str:
+
+        content = json.dumps(params, sort_keys=True, separators=(",", ":"))
+        return f"{network}:{hashlib.sha256(content.encode('utf-8')).hexdigest()[:16]}"
+
+    def get(self, wallet: str) -> Optional[bool]:
+
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT passed FROM verdicts WHERE scope = ? AND wallet = ? AND checked_at >= ?",
+                (self.scope, wallet.lower(), time.time() - self.ttl_seconds)
+            ).fetchone()
+
+            if row is None:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            return bool(row[0])
+
+    def put(self, wallet: str, passed: bool) -> None:
+
+        with self._lock:
+            with self._connection:
+                self._connection.execute(
+                    "INSERT OR REPLACE INTO verdicts (scope, wallet, passed, checked_at) VALUES (?, ?, ?, ?)",
+                    (self.scope, wallet.lower(), int(passed), time.time())
+                )
+
+            self._writes_since_compaction += 1
+            if self._writes_since_compaction >= self.compact_every:
+                self._compact()
+
+    def compact(self) -> None:
+
+        with self._lock:
+            self._compact()
+
+    def _compact(self) -> None:
+
+        with self._connection:
+            self._connection.execute("DELETE FROM verdicts WHERE checked_at < ?", (time.time() - self.ttl_seconds,))
+            self._connection.execute(
+                "DELETE FROM verdicts WHERE rowid IN ("
+                "SELECT rowid FROM verdicts ORDER BY checked_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,)
+            )
+        self._writes_since_compaction = 0
+
+    def close(self) -> None:
+
+        with self._lock:
+            self._compact()
+            self._connection.close()
@@ -1,172 +1,349 @@
-import json
-import os
+import asyncio
 import logging
-from decimal import Decimal, InvalidOperation
-from typing import Dict, List, Tuple, Any, Optional
+from decimal import Decimal
+from typing import Dict, List, Mapping, Sequence, Tuple, Any, Optional
 from .config_manager import ConfigManager
 from .api_client import ApiClient
+from .async_api_client import AsyncApiClient
+from .columnar_engine import ColumnarEngine
+from .filter_chain import FilterChain, WalletFilter
+from .transfer import Transfer, TransferTimeline
+from .verdict_cache import VerdictCache
 from shared.constants.api_constants import ApiConstants
 
+def _as_timeline(transactions: Sequence[Transfer]) -> TransferTimeline:
+
+    return transactions if isinstance(transactions, TransferTimeline) else TransferTimeline(transactions)
+
 class WalletAnalyzer:
     
-    def __init__(self, config_manager: ConfigManager, api_client: ApiClient):
+    def __init__(self, config_manager: ConfigManager, api_client: ApiClient,
+                 async_api_client: Optional[AsyncApiClient] = None):
         self.config_manager = config_manager
         self.api_client = api_client
+        self.async_api_client = async_api_client or AsyncApiClient(api_client)
         self.frequency_interval_seconds = ApiConstants.FREQUENCY_INTERVAL_SECONDS
         self.min_frequency_violations = ApiConstants.MIN_FREQUENCY_VIOLATIONS
         self.min_transaction_count = ApiConstants.MIN_TRANSACTION_COUNT
+        self.frequency_check_concurrency = ApiConstants.FREQUENCY_CHECK_CONCURRENCY
         self.min_usd_value = ApiConstants.MIN_USD_VALUE
         self.min_balance_percentage = Decimal(ApiConstants.MIN_BALANCE_PERCENTAGE) / 100
+        self.columnar_min_transfers = ApiConstants.COLUMNAR_ENGINE_MIN_TRANSFERS
+        self.txlist_checks = 0
         
         paths = config_manager.get_paths_config()
-        self.cache_file = paths["cache_file"]
-        self.frequency_cache = self._load_frequency_cache()
+        verdict_cache_file = paths["verdict_cache_file"] if api_client.cassette is None else None
+        self.verdict_cache = VerdictCache(verdict_cache_file, self._verdict_scope())
     
-    def _load_frequency_cache(self) -> Dict[str, bool]:
-        
-        try:
-            if os.path.exists(self.cache_file):
-                with open(self.cache_file, "r", encoding="utf-8") as f:
-                    return json.load(f)
-        except Exception as e:
-            logging.error(f"Error loading frequency cache: {e}")
-        
-        return {}
+    def _verdict_scope(self) -> str:
+
+        return VerdictCache.make_scope(self.api_client.network_config["chain_id"], {
+            "frequency_interval_seconds": self.frequency_interval_seconds,
+            "min_frequency_violations": self.min_frequency_violations,
+            "min_transaction_count": self.min_transaction_count,
+            "frequency_tx_count": ApiConstants.FREQUENCY_TX_COUNT
+        })
     
-    def save_frequency_cache(self) -> None:
+    def close(self) -> None:
         
-        try:
-            os.makedirs(os.path.dirname(self.cache_file), exist_ok=True)
-            with open(self.cache_file, "w", encoding="utf-8") as f:
-                json.dump(self.frequency_cache, f, indent=2)
-        except Exception as e:
-            logging.error(f"Error saving frequency cache: {e}")
+        self.verdict_cache.close()
     
-    def _check_transaction_frequency(self, transactions: List[Dict[str, Any]]) -> bool:
+    def _is_rejected(self, wallet: str) -> bool:
+
+        return self.verdict_cache.get(wallet) is False
+
+    def _check_transaction_frequency(self, transactions: List[Transfer]) -> bool:
         
         if len(transactions) < 2:
             return True
         
-        sorted_txs = sorted(transactions, key=lambda x: int(x["timeStamp"]), reverse=True)
+        timestamps = sorted((tx.timestamp for tx in transactions), reverse=True)
         
         violations = 0
-        for i in range(len(sorted_txs) - 1):
-            t1 = int(sorted_txs[i]["timeStamp"])
-            t2 = int(sorted_txs[i + 1]["timeStamp"])
-            
-            if (t1 - t2) < self.frequency_interval_seconds:
+        for i in range(len(timestamps) - 1):
+            if (timestamps[i] - timestamps[i + 1]) < self.frequency_interval_seconds:
                 violations += 1
         
         return violations < self.min_frequency_violations
     
-    def check_wallet_token_frequency(self, wallet: str, wallet_transactions: List[Dict[str, Any]]) -> bool:
-        
-        if wallet in self.frequency_cache:
-            return False
-        
+    def _passes_token_frequency(self, wallet_transactions: Sequence[Transfer]) -> bool:
+
         if len(wallet_transactions) < self.min_transaction_count:
             return True
         
-        last_transactions = sorted(
-            wallet_transactions, 
-            key=lambda x: int(x["timeStamp"]), 
-            reverse=True
-        )[:10]
+        last_transactions = _as_timeline(wallet_transactions).transfers[-10:]
+        
+        return self._check_transaction_frequency(last_transactions)
+
+    def check_wallet_token_frequency(self, wallet: str, wallet_transactions: Sequence[Transfer]) -> bool:
         
-        if not self._check_transaction_frequency(last_transactions):
-            self.frequency_cache[wallet] = True
+        if self._is_rejected(wallet):
             return False
         
-        return True
+        return self._passes_token_frequency(wallet_transactions)
+
+    def build_columnar_engine(self, transfers: Sequence[Transfer]) -> Optional[ColumnarEngine]:
+
+        if len(transfers) < self.columnar_min_transfers:
+            return None
+
+        try:
+            return ColumnarEngine(transfers)
+        except ImportError:
+            return None
+        except ValueError as e:
+            logging.warning(f"Columnar engine unavailable, falling back to per-wallet analysis: {e}")
+            return None
+
+    def evaluate_token_frequency(self, wallets: List[str], wallet_transactions: Mapping[str, Sequence[Transfer]],
+                                 engine: Optional[ColumnarEngine] = None) -> Dict[str, bool]:
+
+        if engine is not None:
+            return engine.token_frequency_passes(
+                wallets, self.frequency_interval_seconds, self.min_frequency_violations, self.min_transaction_count
+            )
+
+        return {wallet: self._passes_token_frequency(wallet_transactions.get(wallet, [])) for wallet in wallets}
+
+    def simulate_wallet_balances(self, wallets: List[str], wallet_transactions: Mapping[str, Sequence[Transfer]],
+                                 t1_unix: int, t2_unix: int, t3_unix: int,
+                                 engine: Optional[ColumnarEngine] = None) -> Dict[str, Tuple[Decimal, Decimal, int, int]]:
+
+        if engine is not None:
+            return engine.simulate_balances(wallets, t1_unix, t2_unix, t3_unix)
+
+        decimals = self._token_decimals(wallets, wallet_transactions)
+        return {
+            wallet: self.simulate_wallet_balance(wallet, wallet_transactions.get(wallet, []), t1_unix, t2_unix, t3_unix, decimals)
+            for wallet in wallets
+        }
     
     def check_wallet_general_frequency(self, wallet: str) -> bool:
         
-        if wallet in self.frequency_cache:
-            return False
-        
-        all_transactions = self.api_client.get_wallet_transactions(wallet, count=10)
+        verdict = self.verdict_cache.get(wallet)
+        if verdict is not None:
+            return verdict
         
-        if not self._check_transaction_frequency(all_transactions):
-            self.frequency_cache[wallet] = True
+        self.txlist_checks += 1
+        transactions = self.api_client.get_wallet_transactions(wallet, count=ApiConstants.FREQUENCY_TX_COUNT)
+        if transactions is None:
             return False
         
-        return True
+        passed = self._check_transaction_frequency([Transfer.from_api(tx) for tx in transactions])
+        self.verdict_cache.put(wallet, passed)
+        
+        return passed
+
+    async def check_wallet_general_frequency_async(self, wallet: str) -> bool:
+
+        verdict = self.verdict_cache.get(wallet)
+        if verdict is not None:
+            return verdict
+
+        return bool(await self._fetch_general_frequency_async(wallet))
+
+    async def _fetch_general_frequency_async(self, wallet: str) -> Optional[bool]:
+
+        self.txlist_checks += 1
+        transactions = await self.async_api_client.get_wallet_transactions(wallet, count=ApiConstants.FREQUENCY_TX_COUNT)
+        if transactions is None:
+            return None
+
+        passed = self._check_transaction_frequency([Transfer.from_api(tx) for tx in transactions])
+        self.verdict_cache.put(wallet, passed)
+
+        return passed
     
-    def simulate_wallet_balance(self, wallet: str, wallet_transactions: List[Dict[str, Any]], 
-                               t1_unix: int, t2_unix: int, t3_unix: int) -> Tuple[Decimal, Decimal, int, int]:
+    def simulate_wallet_balance(self, wallet: str, wallet_transactions: Sequence[Transfer], 
+                               t1_unix: int, t2_unix: int, t3_unix: int,
+                               decimals: Optional[int] = None) -> Tuple[Decimal, Decimal, int, int]:
 
-        purchased = Decimal("0")
-        balance = Decimal("0")
+        purchased = 0
+        balance = 0
         purchase_count = 0
         sale_count = 0
         
         wallet_lower = wallet.lower()
+        timeline = _as_timeline(wallet_transactions)
+        start, purchase_end = timeline.bounds(t1_unix, t2_unix)
+        _, end = timeline.bounds(t1_unix, t3_unix)
         
-        for tx in wallet_transactions:
-            timestamp = int(tx["timeStamp"])
-            
-            if not (t1_unix <= timestamp <= t3_unix):
-                continue
-            
-            try:
-                token_decimals = int(tx.get("tokenDecimal", "0"))
-                amount = Decimal(tx["value"]) / (10 ** token_decimals)
-            except (ValueError, TypeError, InvalidOperation) as e:
-                logging.error(f"Error calculating transaction amount: {tx} - {e}")
-                continue
-            
-            if tx["to"].lower() == wallet_lower:
-                balance += amount
+        for position, tx in enumerate(timeline.transfers[start:end], start):
+            if tx.recipient == wallet_lower:
+                balance += tx.value
 
-                if t1_unix <= timestamp <= t2_unix:
-                    purchased += amount
+                if position < purchase_end:
+                    purchased += tx.value
                     purchase_count += 1
             
-            elif tx["from"].lower() == wallet_lower:
-                balance -= amount
+            elif tx.sender == wallet_lower:
+                balance -= tx.value
                 sale_count += 1
         
-        return round(purchased, 2), round(balance, 2), purchase_count, sale_count
+        if decimals is None:
+            decimals = timeline[0].decimals if timeline else 0
+        scale = Decimal(10 ** (decimals or 0))
+        
+        return round(Decimal(purchased) / scale, 2), round(Decimal(balance) / scale, 2), purchase_count, sale_count
+
+    def _token_decimals(self, wallets: List[str], wallet_transactions: Mapping[str, Sequence[Transfer]]) -> int:
+
+        for wallet in wallets:
+            transactions = wallet_transactions.get(wallet)
+            if transactions:
+                return transactions[0].decimals
+        return 0
+
+    def _cached_verdict_filter(self, verdicts: Dict[str, Optional[bool]]) -> WalletFilter:
+
+        async def apply(wallets: List[str]) -> List[str]:
+            passed = []
+            for wallet in wallets:
+                verdicts[wallet] = self.verdict_cache.get(wallet)
+                if verdicts[wallet] is False:
+                    print(f"Portfel {wallet} odrzucony (był w cache).")
+                else:
+                    passed.append(wallet)
+            return passed
+
+        return WalletFilter("cache werdyktów", WalletFilter.CACHE, apply)
+
+    def _token_frequency_filter(self, wallet_transactions: Mapping[str, Sequence[Transfer]],
+                                engine: Optional[ColumnarEngine]) -> WalletFilter:
+
+        async def apply(wallets: List[str]) -> List[str]:
+            token_frequency = self.evaluate_token_frequency(wallets, wallet_transactions, engine)
+            passed = []
+            for wallet in wallets:
+                if token_frequency[wallet]:
+                    passed.append(wallet)
+                else:
+                    print(f"Portfel {wallet} odrzucony (częste transakcje tokena).")
+            return passed
+
+        return WalletFilter("częstotliwość tokena", WalletFilter.LOCAL, apply)
+
+    def _balance_filter(self, wallet_transactions: Mapping[str, Sequence[Transfer]],
+                        t1_unix: int, t2_unix: int, t3_unix: int,
+                        exchange_rate: Optional[float], native_to_usd_rate: Optional[float],
+                        engine: Optional[ColumnarEngine], results: Dict[str, Dict[str, Any]],
+                        rejected: List[str]) -> WalletFilter:
+
+        async def apply(wallets: List[str]) -> List[str]:
+            results.update(self._balance_results(
+                wallets, wallet_transactions, t1_unix, t2_unix, t3_unix, exchange_rate, native_to_usd_rate, engine
+            ))
+            rejected.extend(wallet for wallet in wallets if wallet not in results)
+            return [wallet for wallet in wallets if wallet in results]
+
+        return WalletFilter("saldo i wartość USD", WalletFilter.LOCAL, apply)
+
+    def _general_frequency_filter(self, verdicts: Dict[str, Optional[bool]]) -> WalletFilter:
+
+        async def apply(wallets: List[str]) -> List[str]:
+            total_wallets = len(wallets)
+            checked = 0
+
+            async def check_wallet(wallet: str) -> bool:
+                nonlocal checked
+                verdict = verdicts.get(wallet)
+                passed = verdict if verdict is not None else await self._fetch_general_frequency_async(wallet)
+                checked += 1
+                print(f"{checked}/{total_wallets}: {wallet}")
+                if passed is None:
+                    print(f"Portfel {wallet} odrzucony (nie udało się pobrać transakcji adresu).")
+                elif not passed:
+                    print(f"Portfel {wallet} odrzucony (częste transakcje adresu).")
+                return bool(passed)
+
+            results = await self.async_api_client.map_bounded(
+                check_wallet,
+                wallets,
+                min(self.frequency_check_concurrency, self.async_api_client.max_in_flight)
+            )
+            return [wallet for wallet, passed in zip(wallets, results) if passed]
+
+        return WalletFilter("częstotliwość adresu", WalletFilter.NETWORK, apply)
+
+    def _print_filter_stats(self, chain: FilterChain) -> None:
+
+        for name, before, after in chain.stats:
+            print(f"Filtr {name}: {before} -> {after}")
+
+    async def filter_wallets_by_frequency_async(self, candidate_wallets: List[str],
+                                                wallet_transactions: Mapping[str, Sequence[Transfer]],
+                                                blockchain_analyzer, engine: Optional[ColumnarEngine] = None) -> List[str]:
+
+        verdicts: Dict[str, Optional[bool]] = {}
+        chain = FilterChain([
+            self._cached_verdict_filter(verdicts),
+            self._token_frequency_filter(wallet_transactions, engine),
+            self._general_frequency_filter(verdicts)
+        ])
+
+        return await chain.run_async(candidate_wallets)
 
     def filter_wallets_by_frequency(self, candidate_wallets: List[str],
-                                   wallet_transactions: Dict[str, List[Dict[str, Any]]],
-                                   blockchain_analyzer) -> List[str]:
-        
-        filtered_wallets = []
-        total_wallets = len(candidate_wallets)
-        
-        for index, wallet in enumerate(candidate_wallets, start=1):
-            print(f"{index}/{total_wallets}: {wallet}")
-            
-            if wallet in self.frequency_cache:
-                print(f"Portfel {wallet} odrzucony (był w cache).")
-                continue
-            
-            txs = wallet_transactions.get(wallet, [])
-            if not self.check_wallet_token_frequency(wallet, txs):
-                print(f"Portfel {wallet} odrzucony (częste transakcje tokena).")
-                continue
-            
-            if not self.check_wallet_general_frequency(wallet):
-                print(f"Portfel {wallet} odrzucony (częste transakcje adresu).")
-                continue
-            
-            filtered_wallets.append(wallet)
-        
-        return filtered_wallets
-    
-    def analyze_wallet_balances(self, wallets: List[str], 
-                               wallet_transactions: Dict[str, List[Dict[str, Any]]],
-                               t1_unix: int, t2_unix: int, t3_unix: int,
-                               exchange_rate: Optional[float], native_to_usd_rate: Optional[float]) -> List[Dict[str, Any]]:
+                                   wallet_transactions: Mapping[str, Sequence[Transfer]],
+                                   blockchain_analyzer, engine: Optional[ColumnarEngine] = None) -> List[str]:
+
+        return asyncio.run(self.filter_wallets_by_frequency_async(
+            candidate_wallets,
+            wallet_transactions,
+            blockchain_analyzer,
+            engine
+        ))
+
+    async def select_wallets_async(self, candidate_wallets: List[str],
+                                   wallet_transactions: Mapping[str, Sequence[Transfer]],
+                                   t1_unix: int, t2_unix: int, t3_unix: int,
+                                   exchange_rate: Optional[float], native_to_usd_rate: Optional[float],
+                                   engine: Optional[ColumnarEngine] = None) -> List[Dict[str, Any]]:
+
+        verdicts: Dict[str, Optional[bool]] = {}
+        results: Dict[str, Dict[str, Any]] = {}
+        balance_rejected: List[str] = []
+        chain = FilterChain([
+            self._cached_verdict_filter(verdicts),
+            self._token_frequency_filter(wallet_transactions, engine),
+            self._balance_filter(wallet_transactions, t1_unix, t2_unix, t3_unix,
+                                 exchange_rate, native_to_usd_rate, engine, results, balance_rejected),
+            self._general_frequency_filter(verdicts)
+        ])
+
+        selected = await chain.run_async(candidate_wallets)
+        self._print_filter_stats(chain)
+
+        saved_calls = sum(1 for wallet in balance_rejected if verdicts.get(wallet) is None)
+        print(f"Zapytania txlist pominięte dzięki filtrom lokalnym: {saved_calls}")
+
+        return [results[wallet] for wallet in selected]
+
+    def select_wallets(self, candidate_wallets: List[str],
+                       wallet_transactions: Mapping[str, Sequence[Transfer]],
+                       t1_unix: int, t2_unix: int, t3_unix: int,
+                       exchange_rate: Optional[float], native_to_usd_rate: Optional[float],
+                       engine: Optional[ColumnarEngine] = None) -> List[Dict[str, Any]]:
+
+        return asyncio.run(self.select_wallets_async(
+            candidate_wallets,
+            wallet_transactions,
+            t1_unix, t2_unix, t3_unix,
+            exchange_rate, native_to_usd_rate,
+            engine
+        ))
+
+    def _balance_results(self, wallets: List[str],
+                         wallet_transactions: Mapping[str, Sequence[Transfer]],
+                         t1_unix: int, t2_unix: int, t3_unix: int,
+                         exchange_rate: Optional[float], native_to_usd_rate: Optional[float],
+                         engine: Optional[ColumnarEngine] = None) -> Dict[str, Dict[str, Any]]:
         
-        results = []
+        results = {}
+        balances = self.simulate_wallet_balances(wallets, wallet_transactions, t1_unix, t2_unix, t3_unix, engine)
         
         for wallet in wallets:
-            txs = wallet_transactions.get(wallet, [])
-            purchased, final_balance, purchase_count, sale_count = self.simulate_wallet_balance(
-                wallet, txs, t1_unix, t2_unix, t3_unix
-            )
+            purchased, final_balance, purchase_count, sale_count = balances[wallet]
             
             if purchased == 0:
                 continue
@@ -186,7 +363,7 @@ class WalletAnalyzer:
                 print(f"Portfel {wallet} odrzucony ({usd_value} USD < {ApiConstants.MIN_USD_VALUE} USD).")
                 continue
             
-            results.append({
+            results[wallet] = {
                 "wallet": wallet,
                 "purchase_count": purchase_count,
                 "sale_count": sale_count,
@@ -195,6 +372,16 @@ class WalletAnalyzer:
                 "usd_value": usd_value,
                 "purchased": purchased,
                 "final_balance": final_balance,
-            })
+            }
+        
+        return results
+    
+    def analyze_wallet_balances(self, wallets: List[str], 
+                               wallet_transactions: Mapping[str, Sequence[Transfer]],
+                               t1_unix: int, t2_unix: int, t3_unix: int,
+                               exchange_rate: Optional[float], native_to_usd_rate: Optional[float],
+                               engine: Optional[ColumnarEngine] = None) -> List[Dict[str, Any]]:
         
-        return results
\ No newline at end of file
+        return list(self._balance_results(
+            wallets, wallet_transactions, t1_unix, t2_unix, t3_unix, exchange_rate, native_to_usd_rate, engine
+        ).values())
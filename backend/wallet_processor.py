@@ -1,10 +1,10 @@
 import time
 import os
-import json
 import logging
 from shared.constants.config_constants import ConfigConstants
 from shared.constants.file_constants import FileConstants
 from shared.constants.message_constants import MessageConstants
+from shared.json_codec import JsonCodec
 
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 WALLETS_FOLDER = os.path.join(BASE_DIR, FileConstants.FOLDER_WALLETS)
@@ -14,8 +14,7 @@ LOG_FILE = os.path.join(LOGS_FOLDER, FileConstants.FILE_ERROR_LOG)
 
 def load_json_config(config_file=os.path.join(BASE_DIR, FileConstants.FOLDER_CONFIG, FileConstants.FILE_CONFIG)):
     try:
-        with open(config_file, "r") as f:
-            return json.load(f)
+        return JsonCodec.load_file(config_file)
     except FileNotFoundError:
         print(f"{MessageConstants.ERROR_CONFIG_NOT_FOUND} {config_file}")
     except Exception as e:
@@ -38,11 +37,20 @@ def main():
 
     _setup_environment()
     start_time = time.time()
+    api_client = None
+    async_api_client = None
+    transfer_store = None
+    wallet_analyzer = None
 
     try:
         from .config_manager import ConfigManager
         from .api_client import ApiClient
+        from .async_api_client import AsyncApiClient
+        from .block_index import BlockIndex
         from .blockchain_analyzer import BlockchainAnalyzer
+        from .known_address_index import KnownAddressIndex
+        from .transfer_pipeline import TransferPipeline
+        from .transfer_store import TransferStore
         from .wallet_analyzer import WalletAnalyzer
         from .excel_reporter import ExcelReporter
         from .exchange_rate_service import ExchangeRateService
@@ -59,7 +67,16 @@ def main():
 
         config_manager = ConfigManager()
         api_client = ApiClient(config_manager)
-        blockchain_analyzer = BlockchainAnalyzer(api_client)
+        async_api_client = AsyncApiClient(api_client)
+        if api_client.cassette is None:
+            block_index = BlockIndex(os.path.join(
+                CACHE_FOLDER, FileConstants.FILE_BLOCK_INDEX.format(chain_id=api_client.network_config["chain_id"])
+            ))
+            transfer_store = TransferStore(os.path.join(CACHE_FOLDER, FileConstants.FILE_TRANSFER_STORE))
+        else:
+            print("Kaseta HTTP aktywna: lokalny indeks bloków, magazyn transferów i cache werdyktów są pomijane.")
+            block_index = BlockIndex()
+        blockchain_analyzer = BlockchainAnalyzer(api_client, async_api_client, block_index, transfer_store)
         exchange_rate_service = ExchangeRateService(config_manager, api_client)
 
         token_name = exchange_rate_service.get_token_name(current_token_address)
@@ -69,7 +86,13 @@ def main():
             print(f"Wybrany token: {current_token_address} (nie udało się pobrać nazwy)")
             token_name = current_token_address
 
-        wallet_analyzer = WalletAnalyzer(config_manager, api_client)
+        known_addresses = KnownAddressIndex.load(
+            os.path.join(BASE_DIR, FileConstants.FOLDER_CONFIG, FileConstants.FILE_KNOWN_ADDRESSES), current_network
+        )
+        known_addresses.add_pairs(exchange_rate_service.get_pairs(current_token_address))
+        known_addresses.add(current_token_address, "Token contract")
+
+        wallet_analyzer = WalletAnalyzer(config_manager, api_client, async_api_client)
         excel_reporter = ExcelReporter(config_manager)
 
         try:
@@ -87,26 +110,20 @@ def main():
         end_block = blockchain_analyzer.get_block_by_timestamp(t3_unix, closest="before")
         print(f"Zakres bloków: {start_block} - {end_block}")
 
-        all_transactions = blockchain_analyzer.get_token_transactions(start_block, end_block, current_token_address)
-        print(f"Pobrano łącznie {len(all_transactions)} transakcji tokena.")
-
-        txs_in_period = blockchain_analyzer.filter_transactions_by_timerange(all_transactions, t1_unix, t3_unix)
-        print(f"Transakcje w okresie T1-T3: {len(txs_in_period)}")
-
-        wallet_transactions = blockchain_analyzer.group_transactions_by_wallet(txs_in_period)
+        activity = TransferPipeline(blockchain_analyzer, known_addresses=known_addresses).run(
+            start_block, end_block, current_token_address, t1_unix, t2_unix, t3_unix
+        )
+        print(f"Pobrano łącznie {activity.transfer_count} transakcji tokena.")
+        print(f"Transakcje w okresie T1-T3: {activity.in_period_count}")
 
-        candidate_wallets = blockchain_analyzer.find_candidate_wallets(txs_in_period, t1_unix, t2_unix)
+        wallet_transactions = activity.wallet_transactions
+        candidate_wallets = activity.candidate_wallets
+        columnar_engine = wallet_analyzer.build_columnar_engine(activity.candidate_transfers())
         print(f"Znaleziono {len(candidate_wallets)} kandydatów (portfeli z zakupem w okresie T1-T2).")
+        if activity.excluded_wallets:
+            print(f"Pominięto {len(activity.excluded_wallets)} znanych adresów (routery, pary, kontrakty).")
         print("---")
 
-        filtered_wallets = wallet_analyzer.filter_wallets_by_frequency(
-            candidate_wallets,
-            wallet_transactions,
-            blockchain_analyzer
-        )
-        print("---")
-        print(f"Portfeli po weryfikacji: {len(filtered_wallets)}")
-
         exchange_rate = exchange_rate_service.get_exchange_rate(current_token_address, retries=5)
         if exchange_rate is None:
             print("Nie udało się pobrać kursu wymiany tokena. Wartość natywna nie zostanie obliczona.")
@@ -128,16 +145,35 @@ def main():
 
         print("---")
 
-        final_results = wallet_analyzer.analyze_wallet_balances(
-            filtered_wallets,
+        final_results = wallet_analyzer.select_wallets(
+            candidate_wallets,
             wallet_transactions,
             t1_unix, t2_unix, t3_unix,
-            exchange_rate, native_to_usd_rate
+            exchange_rate, native_to_usd_rate,
+            columnar_engine
         )
         print("---")
         print(f"Portfeli po filtracji: {len(final_results)}")
 
-        wallet_analyzer.save_frequency_cache()
+        block_index.save()
+
+        print(f"Werdykty portfeli z cache: {wallet_analyzer.verdict_cache.hits}, "
+              f"sprawdzone przez API: {wallet_analyzer.txlist_checks}")
+
+        if block_index.hits:
+            print(f"Numery bloków z lokalnego indeksu: {block_index.hits}, zapytania do API: {block_index.misses}")
+
+        print(f"Odpowiedzi API z cache: {api_client.response_cache.hits}, pobrane z sieci: {api_client.response_cache.misses}")
+
+        if api_client.single_flight.shared_count:
+            print(f"Zapytania współdzielone z trwającymi już wywołaniami: {api_client.single_flight.shared_count}")
+
+        for endpoint, retry_stats in api_client.retry_policy.stats().items():
+            print(f"Ponowienia {endpoint}: {retry_stats['retries']} (oczekiwanie {retry_stats['waited_seconds']}s)")
+
+        if len(api_client.api_key_pool) > 1:
+            for key_label, key_stats in api_client.api_key_pool.stats().items():
+                print(f"Klucz API {key_label}: {key_stats['requests']} zapytań, {key_stats['errors']} błędów")
 
         output_filename = excel_reporter.generate_report(final_results, token_name, current_t1_str, current_t2_str, current_t3_str)
         print(f"Raport zapisany do: {output_filename}")
@@ -150,6 +186,15 @@ def main():
         logging.error(f"Main function error: {e}")
         print("A critical error occurred. Check the logs in:", LOG_FILE)
         raise
+    finally:
+        if wallet_analyzer is not None:
+            wallet_analyzer.close()
+        if transfer_store is not None:
+            transfer_store.close()
+        if async_api_client is not None:
+            async_api_client.close()
+        if api_client is not None:
+            api_client.close()
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,80 @@
+import argparse
+import random
+import time
+from decimal import Decimal
+
+from backend.transfer import Transfer, TransferTimeline
+from backend.wallet_analyzer import WalletAnalyzer
+
+T1, T2, T3 = 1710000000, 1710040000, 1710086400
+
+def _decimal_balance(wallet: str, wallet_transactions, t1_unix: int, t2_unix: int, t3_unix: int):
+
+    purchased = Decimal("0")
+    balance = Decimal("0")
+    purchase_count = 0
+    sale_count = 0
+
+    for tx in wallet_transactions:
+        if not (t1_unix <= tx.timestamp <= t3_unix):
+            continue
+
+        amount = Decimal(tx.value) / (10 ** tx.decimals)
+
+        if tx.recipient == wallet:
+            balance += amount
+            if t1_unix <= tx.timestamp <= t2_unix:
+                purchased += amount
+                purchase_count += 1
+        elif tx.sender == wallet:
+            balance -= amount
+            sale_count += 1
+
+    return round(purchased, 2), round(balance, 2), purchase_count, sale_count
+
+def _make_wallets(transfers: int, wallets: int, seed: int):
+
+    rng = random.Random(seed)
+    addresses = [f"0x{index:040x}" for index in range(wallets)]
+    wallet_transactions = {}
+
+    for index in range(transfers):
+        tx = Transfer(19000000 + index // 20, T1 + index * (T3 - T1) // transfers, index % 300, f"0x{index:064x}",
+                      rng.choice(addresses), rng.choice(addresses), 10 ** 24 + rng.randrange(10 ** 22), 18)
+        wallet_transactions.setdefault(tx.sender, []).append(tx)
+        wallet_transactions.setdefault(tx.recipient, []).append(tx)
+
+    return addresses, {wallet: TransferTimeline(txs) for wallet, txs in wallet_transactions.items()}
+
+def _timed(label: str, transfers: int, func):
+
+    started = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - started
+    print(f"{label:<24} {elapsed:7.2f} s  {elapsed / transfers * 1e9:7.0f} ns/transfer")
+    return result
+
+def main():
+
+    parser = argparse.ArgumentParser(description="Per-transfer Decimal vs integer base-unit balance accumulation")
+    parser.add_argument("--transfers", type=int, default=500000)
+    parser.add_argument("--wallets", type=int, default=20000)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    wallets, wallet_transactions = _make_wallets(args.transfers, args.wallets, args.seed)
+    analyzer = object.__new__(WalletAnalyzer)
+    visited = sum(len(wallet_transactions.get(wallet, [])) for wallet in wallets)
+    print(f"{args.transfers} transfers, {len(wallets)} wallets, {visited} wallet-transfer pairs")
+
+    expected = _timed("Decimal per transfer", visited, lambda: {
+        wallet: _decimal_balance(wallet, wallet_transactions.get(wallet, []), T1, T2, T3) for wallet in wallets
+    })
+    balances = _timed("integer base units", visited, lambda: analyzer.simulate_wallet_balances(
+        wallets, wallet_transactions, T1, T2, T3
+    ))
+
+    print(f"identical results: {balances == expected}")
+
+if __name__ == "__main__":
+    main()
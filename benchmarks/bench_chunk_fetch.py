@@ -0,0 +1,61 @@
+import argparse
+import contextlib
+import io
+import time
+from typing import cast
+
+from backend.api_client import ApiClient
+from backend.async_api_client import AsyncApiClient
+from backend.blockchain_analyzer import BlockchainAnalyzer
+from backend.retry_policy import RetryPolicy
+from benchmarks.fixtures import make_transfer
+
+class LatencyApiClient:
+
+    api_url = "https://stand-in.example/api"
+    api_key = "bench-key"
+    network_config = {"finality_seconds": 0}
+    retry_policy = RetryPolicy()
+
+    def __init__(self, latency: float, transfers_per_block: int):
+        self.latency = latency
+        self.transfers_per_block = transfers_per_block
+
+    def make_request_with_retry(self, url, params, retries=None, cache_ttl=None, validate=None, decode=None):
+
+        time.sleep(self.latency)
+        start, end = params["startblock"], params["endblock"]
+        result = []
+        for block in range(start, end + 1):
+            for index in range(self.transfers_per_block):
+                transfer = make_transfer(block * self.transfers_per_block + index)
+                transfer["blockNumber"] = str(block)
+                result.append(transfer)
+        return {"status": "1", "message": "OK", "result": result}
+
+def _measure(label: str, concurrency: int, args: argparse.Namespace) -> None:
+
+    api_client = cast(ApiClient, LatencyApiClient(args.latency, args.transfers_per_block))
+    analyzer = BlockchainAnalyzer(api_client, AsyncApiClient(api_client, max_in_flight=concurrency))
+    analyzer.chunk_concurrency = concurrency
+
+    started = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        transfers = analyzer.get_token_transactions(0, args.blocks - 1, "0x0")
+    elapsed = time.perf_counter() - started
+    print(f"{label:<14} {elapsed:6.2f} s   {len(transfers)} transfers")
+
+def main():
+
+    parser = argparse.ArgumentParser(description="Serial vs concurrent tokentx chunk fetching against a slow stand-in API")
+    parser.add_argument("--blocks", type=int, default=28800)
+    parser.add_argument("--transfers-per-block", type=int, default=5)
+    parser.add_argument("--latency", type=float, default=0.3)
+    parser.add_argument("--concurrency", type=int, default=8)
+    args = parser.parse_args()
+
+    _measure("serial", 1, args)
+    _measure(f"concurrency {args.concurrency}", args.concurrency, args)
+
+if __name__ == "__main__":
+    main()
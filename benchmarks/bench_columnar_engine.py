@@ -0,0 +1,69 @@
+import argparse
+import random
+import time
+
+from backend.columnar_engine import ColumnarEngine
+from backend.transfer import Transfer
+from backend.wallet_analyzer import WalletAnalyzer
+
+T1, T2, T3 = 1710000000, 1710040000, 1710086400
+
+def _make_period(transfers: int, wallets: int, seed: int):
+
+    rng = random.Random(seed)
+    addresses = [f"0x{index:040x}" for index in range(wallets)]
+    period = [
+        Transfer(19000000 + index // 20, T1 + index * (T3 - T1) // transfers, index % 300, f"0x{index:064x}",
+                 rng.choice(addresses), rng.choice(addresses), 10 ** 24 + rng.randrange(10 ** 22), 18)
+        for index in range(transfers)
+    ]
+
+    wallet_transactions = {}
+    for tx in period:
+        wallet_transactions.setdefault(tx.sender, []).append(tx)
+        wallet_transactions.setdefault(tx.recipient, []).append(tx)
+    return addresses, period, wallet_transactions
+
+def _analyzer() -> WalletAnalyzer:
+
+    analyzer = object.__new__(WalletAnalyzer)
+    analyzer.frequency_interval_seconds = 60
+    analyzer.min_frequency_violations = 5
+    analyzer.min_transaction_count = 10
+    return analyzer
+
+def _timed(label: str, func):
+
+    started = time.perf_counter()
+    result = func()
+    print(f"{label:<28} {time.perf_counter() - started:7.2f} s")
+    return result
+
+def main():
+
+    parser = argparse.ArgumentParser(description="Per-wallet loops vs columnar engine for balances and token frequency")
+    parser.add_argument("--transfers", type=int, default=1000000)
+    parser.add_argument("--wallets", type=int, default=50000)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    wallets, period, wallet_transactions = _make_period(args.transfers, args.wallets, args.seed)
+    analyzer = _analyzer()
+    print(f"{args.transfers} transfers, {len(wallets)} candidate wallets")
+
+    expected_balances = _timed("per-wallet balances", lambda: {
+        wallet: analyzer.simulate_wallet_balance(wallet, wallet_transactions.get(wallet, []), T1, T2, T3)
+        for wallet in wallets
+    })
+    expected_frequency = _timed("per-wallet token frequency", lambda: {
+        wallet: analyzer._passes_token_frequency(wallet_transactions.get(wallet, [])) for wallet in wallets
+    })
+
+    engine = _timed("columnar build", lambda: ColumnarEngine(period))
+    balances = _timed("columnar balances", lambda: engine.simulate_balances(wallets, T1, T2, T3))
+    frequency = _timed("columnar token frequency", lambda: engine.token_frequency_passes(wallets, 60, 5, 10))
+
+    print(f"identical results: {balances == expected_balances and frequency == expected_frequency}")
+
+if __name__ == "__main__":
+    main()
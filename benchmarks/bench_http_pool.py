@@ -0,0 +1,93 @@
+import argparse
+import gzip
+import json
+import socket
+import statistics
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, List
+
+import requests
+
+from backend.http_session import HttpSessionPool
+
+PAYLOAD = json.dumps({
+    "status": "1",
+    "message": "OK",
+    "result": [{"blockNumber": str(block), "timeStamp": str(1700000000 + block)} for block in range(200)]
+}).encode("utf-8")
+
+class StandInHandler(BaseHTTPRequestHandler):
+
+    protocol_version = "HTTP/1.1"
+    handshake_delay = 0.0
+
+    def setup(self):
+        super().setup()
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        time.sleep(self.handshake_delay)
+
+    def do_GET(self):
+        body = PAYLOAD
+        gzipped = "gzip" in self.headers.get("Accept-Encoding", "")
+        if gzipped:
+            body = gzip.compress(body)
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        if gzipped:
+            self.send_header("Content-Encoding", "gzip")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+def _measure(fetch: Callable[[], requests.Response], requests_count: int) -> List[float]:
+
+    timings = []
+    for _ in range(requests_count):
+        started = time.perf_counter()
+        response = fetch()
+        response.json()
+        timings.append(time.perf_counter() - started)
+    return timings
+
+def _report(label: str, timings: List[float]) -> float:
+
+    mean_ms = statistics.mean(timings) * 1000
+    p95_ms = sorted(timings)[int(len(timings) * 0.95) - 1] * 1000
+    print(f"{label:<22} mean {mean_ms:7.3f} ms   p95 {p95_ms:7.3f} ms")
+    return mean_ms
+
+def main():
+
+    parser = argparse.ArgumentParser(description="Bare requests.get vs pooled keep-alive sessions")
+    parser.add_argument("--requests", type=int, default=300)
+    parser.add_argument("--handshake-ms", type=float, default=20.0,
+                        help="delay added to every new connection to stand in for the TCP+TLS handshake")
+    args = parser.parse_args()
+
+    StandInHandler.handshake_delay = args.handshake_ms / 1000
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StandInHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/api"
+    params = {"module": "account", "action": "tokentx"}
+
+    pool = HttpSessionPool()
+    try:
+        bare = _measure(lambda: requests.get(url, params=params), args.requests)
+        pooled = _measure(lambda: pool.get(url, params=params), args.requests)
+    finally:
+        pool.close()
+        server.shutdown()
+
+    print(f"{args.requests} requests, simulated handshake {args.handshake_ms} ms")
+    bare_mean = _report("bare requests.get", bare)
+    pooled_mean = _report("pooled session", pooled)
+    print(f"latency saved per request: {bare_mean - pooled_mean:.3f} ms")
+
+if __name__ == "__main__":
+    main()
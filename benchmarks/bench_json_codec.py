@@ -0,0 +1,36 @@
+import argparse
+import json
+import time
+
+from benchmarks.fixtures import make_transfer
+from shared.json_codec import JsonCodec
+
+def _best_of(repeats: int, func) -> float:
+
+    timings = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+def main():
+
+    parser = argparse.ArgumentParser(description="Decode/encode time per MB for each available JSON backend")
+    parser.add_argument("--transfers", type=int, default=10000)
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    document = {"status": "1", "message": "OK", "result": [make_transfer(index) for index in range(args.transfers)]}
+    payload = json.dumps(document)
+    payload_mb = len(payload) / 1024 / 1024
+    print(f"{args.transfers} transfers, payload {payload_mb:.1f} MB, best of {args.repeats}")
+
+    for backend in JsonCodec.available_backends():
+        decode = _best_of(args.repeats, lambda: backend.loads(payload))
+        encode = _best_of(args.repeats, lambda: backend.dumps(document))
+        print(f"{backend.name:<8} decode {decode * 1000 / payload_mb:7.2f} ms/MB   "
+              f"encode {encode * 1000 / payload_mb:7.2f} ms/MB")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+import argparse
+import json
+import time
+import tracemalloc
+from typing import Any, Callable, Iterable
+
+from backend.json_stream import StreamedJsonObject
+from benchmarks.fixtures import make_transfer
+
+def _consume(items: Iterable[Any]) -> int:
+
+    count = 0
+    for item in items:
+        count += len(item["value"])
+    return count
+
+def _measure(label: str, decode: Callable[[], int], payload_mb: float) -> None:
+
+    tracemalloc.start()
+    started = time.perf_counter()
+    decode()
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<18} {elapsed * 1000:8.1f} ms   extra peak {peak / 1024 / 1024:7.1f} MB "
+          f"({peak / 1024 / 1024 / payload_mb:.1f}x payload)")
+
+def main():
+
+    parser = argparse.ArgumentParser(description="Full json.loads vs streamed decoding of a tokentx chunk")
+    parser.add_argument("--transfers", type=int, default=10000)
+    args = parser.parse_args()
+
+    payload = json.dumps({
+        "status": "1",
+        "message": "OK",
+        "result": [make_transfer(index) for index in range(args.transfers)]
+    })
+    payload_mb = len(payload) / 1024 / 1024
+    print(f"{args.transfers} transfers, payload {payload_mb:.1f} MB")
+
+    _measure("json.loads", lambda: _consume(json.loads(payload)["result"]), payload_mb)
+    _measure("streamed", lambda: _consume(StreamedJsonObject(payload, "result")["result"]), payload_mb)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+import argparse
+import random
+import time
+import tracemalloc
+from typing import Any, Callable
+
+from backend.blockchain_analyzer import BlockchainAnalyzer
+from backend.transfer import Transfer
+from backend.transfer_pipeline import WalletActivity
+
+T1, T2, T3 = 1710000000, 1710007200, 1710086400
+
+def _make_period(transfers: int, wallets: int, routers: int, seed: int):
+
+    rng = random.Random(seed)
+    addresses = [f"0x{index:040x}" for index in range(wallets)]
+    router_addresses = addresses[:routers]
+    period = []
+    for index in range(transfers):
+        trader = rng.choice(addresses)
+        router = rng.choice(router_addresses)
+        sender, recipient = (router, trader) if rng.random() < 0.5 else (trader, router)
+        period.append(Transfer(19000000 + index // 20, T1 + index * (T3 - T1) // transfers, index % 300,
+                               f"0x{index:064x}", sender, recipient, 10 ** 21, 18))
+    return period
+
+def _measure(label: str, build: Callable[[], Any]) -> Any:
+
+    started = time.perf_counter()
+    build()
+    elapsed = time.perf_counter() - started
+
+    tracemalloc.start()
+    result = build()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<26} {elapsed * 1000:8.1f} ms   retained {current / 1024 / 1024:7.1f} MB")
+    return result
+
+def main():
+
+    parser = argparse.ArgumentParser(description="Grouping every address vs index lists for candidates only")
+    parser.add_argument("--transfers", type=int, default=1000000)
+    parser.add_argument("--wallets", type=int, default=200000)
+    parser.add_argument("--routers", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    period = _make_period(args.transfers, args.wallets, args.routers, args.seed)
+    analyzer = object.__new__(BlockchainAnalyzer)
+    print(f"{args.transfers} transfers, {args.wallets} addresses, T1-T2 covers {100 * (T2 - T1) // (T3 - T1)}% of the period")
+
+    def group_all():
+        return analyzer.group_transactions_by_wallet(period), analyzer.find_candidate_wallets(period, T1, T2)
+
+    def index_candidates():
+        activity = WalletActivity(T1, T2)
+        activity.add_transfers(period)
+        return activity
+
+    grouped, candidates = _measure("group every address", group_all)
+    activity = _measure("index candidates only", index_candidates)
+    print(f"candidates: {len(candidates)}, identical: {candidates == activity.candidate_wallets}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,24 @@
+def make_transfer(index: int) -> dict:
+
+    return {
+        "blockNumber": str(19000000 + index // 20),
+        "timeStamp": str(1710000000 + index),
+        "hash": f"0x{index:064x}",
+        "nonce": str(index),
+        "blockHash": f"0x{index * 7:064x}",
+        "from": f"0x{index % 5000:040x}",
+        "contractAddress": "0x6982508145454ce325ddbe47a25d4ec3d2311933",
+        "to": f"0x{(index * 31) % 5000:040x}",
+        "value": str(10 ** 24 + index),
+        "tokenName": "Pepe",
+        "tokenSymbol": "PEPE",
+        "tokenDecimal": "18",
+        "transactionIndex": str(index % 200),
+        "gas": "250000",
+        "gasPrice": "30000000000",
+        "gasUsed": "120000",
+        "cumulativeGasUsed": "9000000",
+        "input": "deprecated",
+        "confirmations": "1000",
+        "logIndex": str(index % 300)
+    }
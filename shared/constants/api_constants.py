@@ -9,22 +9,71 @@ load_dotenv(Path(__file__).resolve().parents[2] / ".env")
 class ApiConstants:
     
     ETHERSCAN_API_KEY = os.getenv("ETHERSCAN_API_KEY", "")
+    ETHERSCAN_API_KEYS = [key.strip() for key in os.getenv("ETHERSCAN_API_KEYS", ETHERSCAN_API_KEY).split(",") if key.strip()]
+    ETHERSCAN_DAILY_QUOTA = int(os.getenv("ETHERSCAN_DAILY_QUOTA", "100000"))
+    API_KEY_COOLDOWN_SECONDS = 2.0
+    API_KEY_MAX_COOLDOWN_SECONDS = 60.0
+    ETHERSCAN_REQUESTS_PER_SECOND = float(os.getenv("ETHERSCAN_REQUESTS_PER_SECOND", "5"))
+    ETHERSCAN_BURST = float(os.getenv("ETHERSCAN_BURST", "5"))
     
     DEXSCREENER_API_URL = "https://api.dexscreener.com/latest/dex/tokens/{}"
     COINGECKO_API_URL = "https://api.coingecko.com/api/v3/simple/price"
     
     DEFAULT_TOKEN_ADDRESS = "0x712f43B21cf3e1B189c27678C0f551c08c01D150"
     
-    DELAY_BETWEEN_REQUESTS = 0.2
     MAX_RETRIES = 3
+    RETRY_BASE_DELAY = 0.5
+    RETRY_MAX_DELAY = 30.0
+    CIRCUIT_FAILURE_THRESHOLD = 5
+    CIRCUIT_RESET_SECONDS = 30.0
     REQUEST_TIMEOUT = 10
+
+    HTTP_POOL_CONNECTIONS = 4
+    HTTP_POOL_MAXSIZE = 16
+    HTTP_ACCEPT_ENCODING = "gzip, deflate"
+    ASYNC_MAX_IN_FLIGHT = HTTP_POOL_MAXSIZE
+
+    RATE_LIMITS = {
+        "api.etherscan.io": (ETHERSCAN_REQUESTS_PER_SECOND, ETHERSCAN_BURST),
+        "api.dexscreener.com": (5.0, 5.0),
+        "api.coingecko.com": (0.5, 1.0)
+    }
+    DEFAULT_RATE_LIMIT = (5.0, 5.0)
+
+    RESPONSE_CACHE_BYPASS = os.getenv("RESPONSE_CACHE_BYPASS", "") == "1"
+    RESPONSE_CACHE_MAX_BYTES = int(os.getenv("RESPONSE_CACHE_MAX_MB", "512")) * 1024 * 1024
+    RESPONSE_CACHE_TIP_TTL_SECONDS = 60.0
+
+    HTTP_CASSETTE_MODE = os.getenv("HTTP_CASSETTE_MODE", "").lower()
+    HTTP_CASSETTE_PATH = os.getenv("HTTP_CASSETTE_PATH", "")
+    RATE_LIMIT_MIN_FRACTION = 0.1
+    RATE_LIMIT_ADDITIVE_INCREASE = 0.05
+    RATE_LIMIT_DECREASE_FACTOR = 0.5
     
     BLOCK_CHUNK_SIZE = 1200
+    BLOCK_CHUNK_MIN_SIZE = 1
+    BLOCK_CHUNK_MAX_SIZE = 1000000
+    ETHERSCAN_MAX_RESULTS = 10000
+    CHUNK_TARGET_RESULTS = 5000
+    CHUNK_DENSITY_SMOOTHING = 0.5
+    CHUNK_FETCH_CONCURRENCY = 8
+    CHUNK_MAX_ATTEMPTS = 3
+    PIPELINE_QUEUE_SIZE = 4
+    BLOCK_INDEX_MAX_GAP_SECONDS = 300
+    BLOCK_INDEX_SAMPLE_SPACING_SECONDS = 60
     FREQUENCY_INTERVAL_SECONDS = 60
     MIN_FREQUENCY_VIOLATIONS = 5
     MIN_TRANSACTION_COUNT = 10
+    FREQUENCY_CHECK_CONCURRENCY = 8
+    FREQUENCY_TX_COUNT = 10
+    VERDICT_CACHE_TTL_SECONDS = float(os.getenv("VERDICT_CACHE_TTL_HOURS", "168")) * 3600
+    VERDICT_CACHE_MAX_ENTRIES = int(os.getenv("VERDICT_CACHE_MAX_ENTRIES", "200000"))
+    VERDICT_CACHE_COMPACT_EVERY = 500
     MIN_USD_VALUE = 100.0
     MIN_BALANCE_PERCENTAGE = 50
+    COLUMNAR_ENGINE_MIN_TRANSFERS = 20000
+    KNOWN_ADDRESS_BLOOM_MIN_ENTRIES = 100000
+    KNOWN_ADDRESS_BLOOM_ERROR_RATE = 1e-6
     
     API_MODULE_ACCOUNT = "account"
     API_MODULE_BLOCK = "block"
@@ -7,7 +7,12 @@ class FileConstants:
     FOLDER_IMAGES = "frontend/assets"
     
     FILE_CONFIG = "config.json"
+    FILE_KNOWN_ADDRESSES = "known_addresses.json"
     FILE_ERROR_LOG = "error_log.txt"
-    FILE_WALLET_CACHE = "wallet_frequency_cache.json"
+    FILE_VERDICT_CACHE = "wallet_verdicts.sqlite"
+    FILE_RESPONSE_CACHE = "api_responses.sqlite"
+    FILE_HTTP_CASSETTE = "http_cassette.jsonl.gz"
+    FILE_BLOCK_INDEX = "block_index_{chain_id}.json"
+    FILE_TRANSFER_STORE = "token_transfers.sqlite"
     FILE_NETWORKS_CACHE = "networks_cache.json"
     FILE_APP_ICON = "icon.png"
\ No newline at end of file
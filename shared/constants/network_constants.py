@@ -20,6 +20,7 @@ class NetworkConstants:
             "native_token_name": "ETH",
             "native_token_full_name": "ethereum",
             "native_address": WETH_ADDRESS_ETH,
+            "finality_seconds": 960,
             "explorer": "https://etherscan.io"
         },
         "BSC": {
@@ -28,6 +29,7 @@ class NetworkConstants:
             "native_token_name": "BNB",
             "native_token_full_name": "binancecoin",
             "native_address": WBNB_ADDRESS_BSC,
+            "finality_seconds": 60,
             "explorer": "https://bscscan.com"
         },
         "BASE": {
@@ -36,6 +38,7 @@ class NetworkConstants:
             "native_token_name": "ETH",
             "native_token_full_name": "ethereum",
             "native_address": WETH_ADDRESS_BASE,
+            "finality_seconds": 1200,
             "explorer": "https://basescan.org"
         }
     }
\ No newline at end of file
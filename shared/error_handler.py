@@ -1,6 +1,7 @@
 import json
 import logging
 import os
+from shared.json_codec import JsonCodec
 from typing import Optional
 
 class ErrorHandler:
@@ -16,8 +17,7 @@ class ErrorHandler:
                 logging.warning(f"File does not exist: {file_path}")
                 return default_return
                 
-            with open(file_path, "r", encoding="utf-8") as f:
-                return json.load(f)
+            return JsonCodec.load_file(file_path)
                 
         except json.JSONDecodeError as e:
             logging.error(f"JSON parsing error in file {file_path}: {e}")
@@ -33,8 +33,7 @@ class ErrorHandler:
             if create_dirs:
                 os.makedirs(os.path.dirname(file_path), exist_ok=True)
                 
-            with open(file_path, "w", encoding="utf-8") as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
+            JsonCodec.save_file(data, file_path, indent=True)
             return True
             
         except Exception as e:
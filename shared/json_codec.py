@@ -0,0 +1,89 @@
+import json
+import os
+from typing import Any, Dict, List, Type, Union
+
+class StdlibJsonBackend:
+
+    name = "json"
+
+    def loads(self, data: Union[str, bytes]) -> Any:
+        return json.loads(data)
+
+    def dumps(self, obj: Any, indent: bool = False) -> str:
+        if indent:
+            return json.dumps(obj, indent=2, ensure_ascii=False)
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+
+class OrjsonBackend:
+
+    name = "orjson"
+
+    def __init__(self):
+        import orjson
+        self._orjson = orjson
+
+    def loads(self, data: Union[str, bytes]) -> Any:
+        return self._orjson.loads(data)
+
+    def dumps(self, obj: Any, indent: bool = False) -> str:
+        return self._orjson.dumps(obj, option=self._orjson.OPT_INDENT_2 if indent else 0).decode("utf-8")
+
+class JsonCodec:
+
+    BACKENDS: Dict[str, Type[Any]] = {
+        OrjsonBackend.name: OrjsonBackend,
+        StdlibJsonBackend.name: StdlibJsonBackend
+    }
+
+    _backend: Any = None
+
+    @staticmethod
+    def available_backends() -> List[Any]:
+
+        backends = []
+        for backend_class in JsonCodec.BACKENDS.values():
+            try:
+                backends.append(backend_class())
+            except ImportError:
+                continue
+        return backends
+
+    @staticmethod
+    def use(name: str) -> None:
+
+        if name not in JsonCodec.BACKENDS:
+            raise ValueError(f"Unknown JSON backend: {name}")
+        JsonCodec._backend = JsonCodec.BACKENDS[name]()
+
+    @staticmethod
+    def backend() -> Any:
+
+        if JsonCodec._backend is None:
+            preferred = os.getenv("JSON_BACKEND", "").lower()
+            if preferred in JsonCodec.BACKENDS:
+                JsonCodec.use(preferred)
+            else:
+                JsonCodec._backend = JsonCodec.available_backends()[0]
+        return JsonCodec._backend
+
+    @staticmethod
+    def loads(data: Union[str, bytes]) -> Any:
+
+        return JsonCodec.backend().loads(data)
+
+    @staticmethod
+    def dumps(obj: Any, indent: bool = False) -> str:
+
+        return JsonCodec.backend().dumps(obj, indent)
+
+    @staticmethod
+    def load_file(file_path: str) -> Any:
+
+        with open(file_path, "rb") as f:
+            return JsonCodec.loads(f.read())
+
+    @staticmethod
+    def save_file(obj: Any, file_path: str, indent: bool = False) -> None:
+
+        with open(file_path, "w", encoding="utf-8") as f:
+            f.write(JsonCodec.dumps(obj, indent))
@@ -0,0 +1,109 @@
+import json
+
+import requests
+
+from backend.api_client import ApiClient
+from backend.config_manager import ConfigManager
+from backend.http_cassette import HttpCassette
+from backend.response_cache import ResponseCache
+from backend.retry_policy import RetryPolicy
+
+
+def _response(status: int, payload) -> requests.Response:
+    response = requests.Response()
+    response.status_code = status
+    response.encoding = "utf-8"
+    response._content = json.dumps(payload).encode("utf-8")
+    return response
+
+
+class ScriptedSessionPool:
+
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.calls = []
+
+    def get(self, url, **kwargs):
+        self.calls.append(kwargs["params"])
+        return self.responses.pop(0)
+
+    def close(self):
+        pass
+
+
+def _client(tmp_path, responses, api_keys=None) -> ApiClient:
+    return ApiClient(
+        ConfigManager(str(tmp_path / "config.json")),
+        session_pool=ScriptedSessionPool(responses),
+        api_keys=api_keys or ["key-a"],
+        response_cache=ResponseCache(str(tmp_path / "cache.sqlite")),
+        retry_policy=RetryPolicy(base_delay=0.0, max_delay=0.0)
+    )
+
+
+def test_invalid_etherscan_response_is_retried_in_a_single_loop(tmp_path):
+    client = _client(tmp_path, [
+        _response(200, {"status": "0", "message": "NOTOK", "result": "Unexpected error"}),
+        _response(200, {"status": "1", "message": "OK", "result": [{"hash": "0x1"}]}),
+    ])
+    assert client.etherscan_api_request({"module": "account", "action": "txlist"})["result"] == [{"hash": "0x1"}]
+    assert client.retry_policy.stats()["api.etherscan.io txlist"]["retries"] == 1
+
+
+def test_no_transactions_found_is_an_empty_result(tmp_path):
+    client = _client(tmp_path, [
+        _response(200, {"status": "0", "message": "No transactions found", "result": []}),
+    ])
+    assert client.etherscan_api_request({"module": "account", "action": "txlist"}) == {"result": []}
+
+
+def test_retries_rotate_across_api_keys(tmp_path):
+    client = _client(tmp_path, [
+        _response(200, {"status": "0", "message": "NOTOK", "result": "Max rate limit reached"}),
+        _response(200, {"status": "1", "message": "OK", "result": []}),
+    ], api_keys=["key-a", "key-b"])
+    client.etherscan_api_request({"module": "account", "action": "txlist"})
+    assert [call["apikey"] for call in client.session_pool.calls] == ["key-a", "key-b"]
+
+
+def test_cached_response_skips_the_network(tmp_path):
+    client = _client(tmp_path, [_response(200, {"status": "1", "message": "OK", "result": "123"})])
+    params = {"module": "block", "action": "getblocknobytime", "timestamp": 1}
+    first = client.make_request_with_retry(client.api_url, params, cache_ttl=ResponseCache.NO_EXPIRY)
+    second = client.make_request_with_retry(client.api_url, params, cache_ttl=ResponseCache.NO_EXPIRY)
+    assert first == second == {"status": "1", "message": "OK", "result": "123"}
+    assert len(client.session_pool.calls) == 1
+
+
+def test_open_circuit_stops_retrying(tmp_path):
+    client = _client(tmp_path, [_response(503, {}) for _ in range(10)])
+    client.max_retries = 10
+    assert client.make_request_with_retry("https://stand-in.example/api", {}) is None
+    assert len(client.session_pool.calls) == 5
+
+
+def test_throttled_half_open_probe_closes_the_circuit(tmp_path):
+    client = _client(tmp_path, [_response(429, {}), _response(200, {"ok": True})])
+    breaker = client.retry_policy.breaker("https://stand-in.example/api")
+    breaker.reset_seconds = 0.0
+    breaker.state, breaker.failures = breaker.OPEN, breaker.failure_threshold
+    client.max_retries = 2
+    assert client.make_request_with_retry("https://stand-in.example/api", {}) == {"ok": True}
+    assert breaker.state == breaker.CLOSED
+
+
+def test_cassette_run_does_not_write_the_response_cache(tmp_path):
+    cassette = HttpCassette(str(tmp_path / "run.jsonl.gz"), HttpCassette.RECORD)
+    client = ApiClient(
+        ConfigManager(str(tmp_path / "config.json")),
+        session_pool=ScriptedSessionPool([_response(200, {"status": "1", "message": "OK", "result": "123"})]),
+        api_keys=["key-a"],
+        cassette=cassette,
+        retry_policy=RetryPolicy(base_delay=0.0, max_delay=0.0)
+    )
+    params = {"module": "block", "action": "getblocknobytime", "timestamp": 1}
+    client.make_request_with_retry(client.api_url, params, cache_ttl=ResponseCache.NO_EXPIRY)
+    assert client.response_cache.disabled
+    assert client.response_cache.db_path == ResponseCache.IN_MEMORY
+    assert len(client.response_cache._connection.execute("SELECT key FROM responses").fetchall()) == 0
+    client.close()
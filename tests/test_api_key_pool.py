@@ -0,0 +1,32 @@
+from backend.api_key_pool import ApiKeyPool
+from backend.rate_limiter import RateLimiter
+
+URL = "https://api.etherscan.io/v2/api?chainid=1"
+
+
+def _pool(keys):
+    return ApiKeyPool(keys, URL, RateLimiter({"api.etherscan.io": (5.0, 5.0)}))
+
+
+def test_requests_are_spread_across_keys():
+    pool = _pool(["key-a", "key-b", "key-c"])
+    picked = [pool.acquire() for _ in range(6)]
+    for key in ["key-a", "key-b", "key-c"]:
+        assert picked.count(key) == 2
+
+
+def test_key_in_cooldown_is_skipped():
+    pool = _pool(["key-a", "key-b"])
+    pool.report_error("key-a")
+    assert {pool.acquire() for _ in range(4)} == {"key-b"}
+
+
+def test_success_resets_consecutive_errors():
+    pool = _pool(["key-a"])
+    pool.report_error("key-a")
+    pool.report_success("key-a")
+    assert pool.stats()["...ey-a"] == {"requests": 0, "errors": 1}
+
+
+def test_empty_key_list_still_yields_a_key():
+    assert _pool([]).acquire() == ""
@@ -0,0 +1,57 @@
+from backend.block_index import BlockIndex
+from backend.transfer import Transfer
+from shared.constants.api_constants import ApiConstants
+
+
+def _transfer(timestamp, block):
+    return Transfer(block, timestamp, 0, f"0x{block:x}", "0xaa", "0xbb", 1, 0)
+
+
+def test_exact_answer_is_served_from_index():
+    index = BlockIndex()
+    index.add_answer(1700000000, "after", 100)
+    assert index.lookup(1700000000, "after") == 100
+    assert index.hits == 1
+
+
+def test_brackets_are_conservative_for_both_directions():
+    index = BlockIndex(max_gap_seconds=300)
+    index.add_answer(1000, "before", 10)
+    index.add_answer(1200, "after", 30)
+    assert index.lookup(1100, "after") == 10
+    assert index.lookup(1100, "before") == 30
+
+
+def test_sample_at_same_timestamp_is_not_used_as_bracket():
+    index = BlockIndex(max_gap_seconds=300)
+    index.add_transfer_samples([_transfer(1000, 10)], max_timestamp=2000)
+    assert index.lookup(1000, "after") is None
+    assert index.lookup(1000, "before") is None
+    assert index.lookup(1001, "after") == 10
+
+
+def test_query_too_far_from_known_samples_misses():
+    index = BlockIndex(max_gap_seconds=300)
+    index.add_answer(1000, "before", 10)
+    assert index.lookup(1301, "after") is None
+    assert index.lookup(500, "after") is None
+    assert index.misses == 2
+
+
+def test_transfer_samples_are_thinned_and_stop_at_finality_horizon():
+    spacing = ApiConstants.BLOCK_INDEX_SAMPLE_SPACING_SECONDS
+    transfers = [_transfer(1000 + offset, 10 + offset) for offset in range(0, spacing * 3, 5)]
+    index = BlockIndex()
+    index.add_transfer_samples(transfers, max_timestamp=1000 + spacing * 2)
+    assert len(index) == 3
+
+
+def test_index_round_trips_through_file(tmp_path):
+    file_path = str(tmp_path / "cache" / "block_index_1.json")
+    index = BlockIndex(file_path)
+    index.add_answer(1000, "before", 10)
+    index.save()
+
+    reloaded = BlockIndex(file_path)
+    assert reloaded.lookup(1000, "before") == 10
+    assert len(reloaded) == 1
@@ -0,0 +1,267 @@
+import json
+import random
+import time
+
+import pytest
+import requests
+
+from backend.api_client import ApiClient
+from backend.async_api_client import AsyncApiClient
+from backend.blockchain_analyzer import BlockchainAnalyzer
+from backend.config_manager import ConfigManager
+from backend.response_cache import ResponseCache
+from backend.retry_policy import RetryPolicy
+from backend.transfer_store import TransferStore
+from shared.constants.api_constants import ApiConstants
+
+CONTRACT = "0x3333333333333333333333333333333333333333"
+SENDER = "0x4444444444444444444444444444444444444444"
+
+
+class FakeApiClient:
+
+    api_url = "https://api.etherscan.io/v2/api?chainid=1"
+    api_key = "test-key"
+    retry_policy = RetryPolicy(base_delay=0.0, max_delay=0.0)
+
+    def __init__(self, transfers_per_block=None):
+        self.transfers_per_block = transfers_per_block or {}
+        self.requested_ranges = []
+
+    def make_request_with_retry(self, url, params, retries=None, cache_ttl=None, validate=None, decode=None):
+        start, end = params["startblock"], params["endblock"]
+        self.requested_ranges.append((start, end))
+        time.sleep(0.02 if start == 0 else 0.0)
+        result = [
+            {"blockNumber": str(block), "timeStamp": str(1600000000 + block * 12), "hash": f"0x{block:x}",
+             "logIndex": str(index), "from": SENDER, "to": CONTRACT, "value": "1"}
+            for block in range(start, end + 1)
+            for index in range(self.transfers_per_block.get(block, 0))
+        ]
+        return {"status": "1", "message": "OK", "result": result}
+
+
+def _analyzer(api_client) -> BlockchainAnalyzer:
+    return BlockchainAnalyzer(api_client, AsyncApiClient(api_client, max_in_flight=4))
+
+
+def test_token_transactions_are_merged_in_block_order():
+    api_client = FakeApiClient({block: 1 for block in range(0, 30000, 500)})
+    transactions = _analyzer(api_client).get_token_transactions(0, 29999, CONTRACT)
+    assert [tx.block for tx in transactions] == list(range(0, 30000, 500))
+
+
+def test_first_chunk_probes_with_default_size_and_quiet_range_grows():
+    api_client = FakeApiClient({0: 1})
+    _analyzer(api_client).get_token_transactions(0, 500000, CONTRACT)
+    assert api_client.requested_ranges[0] == (0, ApiConstants.BLOCK_CHUNK_SIZE - 1)
+    assert len(api_client.requested_ranges) == 2
+
+
+class JitteryApiClient(FakeApiClient):
+
+    def __init__(self, transfers_per_block, seed):
+        super().__init__(transfers_per_block)
+        self.rng = random.Random(seed)
+
+    def make_request_with_retry(self, url, params, retries=None, cache_ttl=None, validate=None, decode=None):
+        time.sleep(self.rng.uniform(0.0, 0.02))
+        return super().make_request_with_retry(url, params, retries, cache_ttl, validate, decode)
+
+
+def test_chunk_boundaries_do_not_depend_on_completion_order():
+    transfers_per_block = {block: 1 + block * 7919 % 17 for block in range(0, 50000, 4)}
+    ranges = []
+    for seed in range(3):
+        api_client = JitteryApiClient(transfers_per_block, seed)
+        _analyzer(api_client).get_token_transactions(0, 49999, CONTRACT)
+        ranges.append(sorted(api_client.requested_ranges))
+    assert len(ranges[0]) > 4
+    assert ranges[0] == ranges[1] == ranges[2]
+
+
+def test_saturated_chunk_is_split_until_complete():
+    last_block = ApiConstants.BLOCK_CHUNK_SIZE - 1
+    per_block = ApiConstants.ETHERSCAN_MAX_RESULTS // ApiConstants.BLOCK_CHUNK_SIZE + 1
+    api_client = FakeApiClient({block: per_block for block in range(last_block + 1)})
+    transactions = _analyzer(api_client).get_token_transactions(0, last_block, CONTRACT)
+    middle = (last_block + 1) // 2
+    assert api_client.requested_ranges[0] == (0, last_block)
+    assert sorted(api_client.requested_ranges[1:]) == [(0, middle - 1), (middle, last_block)]
+    assert len(transactions) == (last_block + 1) * per_block
+
+
+def test_saturated_chunk_with_malformed_row_is_still_split():
+    class CappedApiClient(FakeApiClient):
+        def make_request_with_retry(self, url, params, retries=None, cache_ttl=None, validate=None, decode=None):
+            data = super().make_request_with_retry(url, params, retries, cache_ttl, validate, decode)
+            data["result"] = data["result"][:ApiConstants.ETHERSCAN_MAX_RESULTS]
+            data["result"][0] = {"blockNumber": str(params["startblock"]), "timeStamp": "not-a-number"}
+            return data
+
+    last_block = ApiConstants.BLOCK_CHUNK_SIZE - 1
+    per_block = ApiConstants.ETHERSCAN_MAX_RESULTS // ApiConstants.BLOCK_CHUNK_SIZE + 1
+    api_client = CappedApiClient({block: per_block for block in range(last_block + 1)})
+    transactions = _analyzer(api_client).get_token_transactions(0, last_block, CONTRACT)
+    middle = (last_block + 1) // 2
+    assert sorted(api_client.requested_ranges[1:]) == [(0, middle - 1), (middle, last_block)]
+    assert len(transactions) == (last_block + 1) * per_block - 2
+
+
+def test_duplicates_at_chunk_seams_are_dropped():
+    class OverlappingApiClient(FakeApiClient):
+        def make_request_with_retry(self, url, params, retries=None, cache_ttl=None, validate=None, decode=None):
+            data = super().make_request_with_retry(url, params, retries, cache_ttl, validate, decode)
+            seam = params["startblock"] - 1
+            if seam >= 0:
+                data["result"].insert(0, {"blockNumber": str(seam), "timeStamp": str(1600000000 + seam * 12),
+                                          "hash": f"0x{seam:x}", "logIndex": "0", "from": SENDER, "to": CONTRACT, "value": "1"})
+            return data
+
+    api_client = OverlappingApiClient({block: 1 for block in range(0, 5000)})
+    transactions = _analyzer(api_client).get_token_transactions(0, 4999, CONTRACT)
+    assert [tx.block for tx in transactions] == list(range(5000))
+
+
+class FlakyApiClient(FakeApiClient):
+
+    def __init__(self, transfers_per_block=None, failures=None):
+        super().__init__(transfers_per_block)
+        self.failures = failures or {}
+
+    def make_request_with_retry(self, url, params, retries=None, cache_ttl=None, validate=None, decode=None):
+        start = params["startblock"]
+        if self.failures.get(start, 0) > 0:
+            self.failures[start] -= 1
+            self.requested_ranges.append((start, params["endblock"]))
+            return None
+        return super().make_request_with_retry(url, params, retries, cache_ttl, validate, decode)
+
+
+def test_failed_chunk_is_retried_instead_of_dropped():
+    api_client = FlakyApiClient({block: 1 for block in range(0, 30000, 500)}, failures={0: 1})
+    transactions = _analyzer(api_client).get_token_transactions(0, 29999, CONTRACT)
+    assert [tx.block for tx in transactions] == list(range(0, 30000, 500))
+    assert api_client.requested_ranges.count(api_client.requested_ranges[0]) == 2
+
+
+def test_chunk_failing_every_attempt_aborts_the_fetch():
+    api_client = FlakyApiClient({0: 1}, failures={0: ApiConstants.CHUNK_MAX_ATTEMPTS})
+    with pytest.raises(Exception, match="after 3 attempts"):
+        _analyzer(api_client).get_token_transactions(0, 5000, CONTRACT)
+
+
+def test_failed_chunk_waits_for_open_circuit_before_retrying():
+    api_client = FlakyApiClient({0: 1}, failures={0: 2})
+    api_client.retry_policy = RetryPolicy(base_delay=0.0, max_delay=0.0)
+    breaker = api_client.retry_policy.breaker(api_client.api_url)
+    breaker.reset_seconds = 0.2
+    for _ in range(breaker.failure_threshold):
+        breaker.record_failure()
+
+    started = time.perf_counter()
+    transactions = _analyzer(api_client).get_token_transactions(0, 5000, CONTRACT)
+    assert time.perf_counter() - started >= 0.2
+    assert [tx.block for tx in transactions] == [0]
+
+
+class ScriptedSessionPool:
+
+    def __init__(self, bodies):
+        self.bodies = list(bodies)
+        self.calls = []
+
+    def get(self, url, **kwargs):
+        self.calls.append(kwargs["params"])
+        response = requests.Response()
+        response.status_code = 200
+        response.encoding = "utf-8"
+        response._content = self.bodies.pop(0).encode("utf-8")
+        return response
+
+    def close(self):
+        pass
+
+
+def test_truncated_cached_chunk_is_evicted_and_refetched(tmp_path):
+    transfer = {"blockNumber": "5", "timeStamp": "1600000060", "hash": "0x5", "logIndex": "0",
+                "from": SENDER, "to": CONTRACT, "value": "1"}
+    body = json.dumps({"status": "1", "message": "OK", "result": [transfer, transfer]})
+    api_client = ApiClient(
+        ConfigManager(str(tmp_path / "config.json")),
+        session_pool=ScriptedSessionPool([body[:-40], body]),
+        api_keys=["key-a"],
+        response_cache=ResponseCache(str(tmp_path / "cache.sqlite")),
+        retry_policy=RetryPolicy(base_delay=0.0, max_delay=0.0)
+    )
+    analyzer = _analyzer(api_client)
+    analyzer.finalized_block = 1000
+
+    transactions = analyzer.get_token_transactions(0, 999, CONTRACT)
+
+    assert [tx.block for tx in transactions] == [5, 5]
+    assert len(api_client.session_pool.calls) == 2
+
+
+def test_finalized_block_lookups_are_answered_from_block_index():
+    class BlockApiClient(FakeApiClient):
+        network_config = {"finality_seconds": 60}
+
+        def make_request_with_retry(self, url, params, retries=None, cache_ttl=None, validate=None, decode=None):
+            self.requested_ranges.append((params["timestamp"], params["closest"]))
+            return {"status": "1", "message": "OK", "result": str(params["timestamp"] // 12)}
+
+    api_client = BlockApiClient()
+    analyzer = _analyzer(api_client)
+    assert analyzer.get_block_by_timestamp(1700000000, closest="after") == 1700000000 // 12
+    assert analyzer.get_block_by_timestamp(1700000000, closest="after") == 1700000000 // 12
+    assert analyzer.get_block_by_timestamp(1700000100, closest="after") == 1700000000 // 12
+    assert len(api_client.requested_ranges) == 1
+
+
+def test_stored_blocks_are_not_fetched_again_but_tip_is(tmp_path):
+    api_client = FakeApiClient({block: 1 for block in range(0, 3000, 100)})
+    api_client.network_config = {"chain_id": 1, "finality_seconds": 960}
+    analyzer = BlockchainAnalyzer(api_client, AsyncApiClient(api_client, max_in_flight=4),
+                                  transfer_store=TransferStore(str(tmp_path / "transfers.sqlite")))
+    analyzer.finalized_block = 1999
+
+    first = analyzer.get_token_transactions(0, 2499, CONTRACT)
+    api_client.requested_ranges.clear()
+    second = analyzer.get_token_transactions(500, 2999, CONTRACT)
+
+    assert [tx.block for tx in first] == list(range(0, 2500, 100))
+    assert [tx.block for tx in second] == list(range(500, 3000, 100))
+    assert min(start for start, _ in api_client.requested_ranges) == 2000
+
+
+def test_transfers_without_log_index_in_one_transaction_are_all_kept(tmp_path):
+    class NoLogIndexApiClient(FakeApiClient):
+        def make_request_with_retry(self, url, params, retries=None, cache_ttl=None, validate=None, decode=None):
+            data = super().make_request_with_retry(url, params, retries, cache_ttl, validate, decode)
+            for tx in data["result"]:
+                del tx["logIndex"]
+            return data
+
+    api_client = NoLogIndexApiClient({5: 2, 1500: 3})
+    api_client.network_config = {"chain_id": 1, "finality_seconds": 960}
+    store = TransferStore(str(tmp_path / "transfers.sqlite"))
+    analyzer = BlockchainAnalyzer(api_client, AsyncApiClient(api_client, max_in_flight=4), transfer_store=store)
+    analyzer.finalized_block = 1999
+
+    transactions = analyzer.get_token_transactions(0, 1999, CONTRACT)
+
+    assert [tx.block for tx in transactions] == [5, 5, 1500, 1500, 1500]
+    assert [tx.block for tx in store.load(1, CONTRACT, 0, 1999)] == [5, 5, 1500, 1500, 1500]
+
+
+def test_malformed_transfers_are_skipped_at_ingest():
+    class MalformedApiClient(FakeApiClient):
+        def make_request_with_retry(self, url, params, retries=None, cache_ttl=None, validate=None, decode=None):
+            data = super().make_request_with_retry(url, params, retries, cache_ttl, validate, decode)
+            data["result"].append({"blockNumber": str(params["endblock"]), "timeStamp": "not-a-number"})
+            return data
+
+    api_client = MalformedApiClient({0: 1})
+    transactions = _analyzer(api_client).get_token_transactions(0, 100, CONTRACT)
+    assert [tx.block for tx in transactions] == [0]
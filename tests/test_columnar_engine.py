@@ -0,0 +1,102 @@
+import random
+from decimal import Decimal
+
+import pytest
+
+numpy = pytest.importorskip("numpy")
+
+from backend.columnar_engine import ColumnarEngine
+from backend.transfer import Transfer
+from backend.verdict_cache import VerdictCache
+from backend.wallet_analyzer import WalletAnalyzer
+
+WALLET = "0x1111111111111111111111111111111111111111"
+OTHER = "0x2222222222222222222222222222222222222222"
+
+
+def _analyzer() -> WalletAnalyzer:
+    analyzer = object.__new__(WalletAnalyzer)
+    analyzer.frequency_interval_seconds = 60
+    analyzer.min_frequency_violations = 5
+    analyzer.min_transaction_count = 10
+    analyzer.columnar_min_transfers = 0
+    analyzer.verdict_cache = VerdictCache()
+    return analyzer
+
+
+def _random_period(seed: int, transfers: int = 3000, wallets: int = 40, span: int = 20000):
+    rng = random.Random(seed)
+    addresses = [f"0x{index:040x}" for index in range(wallets)]
+    period = []
+    for index in range(transfers):
+        sender, recipient = rng.choice(addresses), rng.choice(addresses)
+        value = rng.choice([rng.randrange(10 ** 6), rng.randrange(2 ** 64, 2 ** 80)])
+        period.append(Transfer(index, 1000 + rng.randrange(span), index % 5, f"0x{index:x}", sender, recipient, value, 18))
+
+    wallet_transactions = {}
+    for tx in period:
+        wallet_transactions.setdefault(tx.sender, []).append(tx)
+        wallet_transactions.setdefault(tx.recipient, []).append(tx)
+    return addresses, period, wallet_transactions
+
+
+@pytest.mark.parametrize("seed", [1, 2, 3])
+def test_balances_match_per_wallet_simulation(seed):
+    wallets, period, wallet_transactions = _random_period(seed)
+    engine = ColumnarEngine(period)
+    analyzer = _analyzer()
+    expected = {
+        wallet: analyzer.simulate_wallet_balance(wallet, wallet_transactions[wallet], 3000, 9000, 15000)
+        for wallet in wallets
+    }
+    assert engine.simulate_balances(wallets, 3000, 9000, 15000) == expected
+
+
+@pytest.mark.parametrize("seed", [1, 2, 3])
+def test_token_frequency_matches_per_wallet_check(seed):
+    wallets, period, wallet_transactions = _random_period(seed, transfers=400, wallets=30, span=4000)
+    analyzer = _analyzer()
+    expected = {wallet: analyzer._passes_token_frequency(wallet_transactions[wallet]) for wallet in wallets}
+    engine = analyzer.build_columnar_engine(period)
+    assert analyzer.evaluate_token_frequency(wallets, wallet_transactions, engine) == expected
+    assert set(expected.values()) == {True, False}
+
+
+def test_large_amounts_stay_exact():
+    big = 2 ** 200 + 1
+    transfers = [Transfer(index, 100 + index, 0, f"0x{index:x}", OTHER, WALLET, big, 0) for index in range(3)]
+    engine = ColumnarEngine(transfers)
+    sums = engine._group_sums(engine.recipient_ids, numpy.ones(3, dtype=bool), numpy.ones(3))
+    assert engine._limbs_to_ints(sums)[engine.wallet_ids[WALLET]] == big * 3
+
+
+def test_self_transfer_counts_as_receipt_only():
+    transfers = [Transfer(1, 150, 0, "0x1", WALLET, WALLET, 5, 0)]
+    wallet_transactions = {WALLET: transfers * 2}
+    engine = ColumnarEngine(transfers)
+    expected = _analyzer().simulate_wallet_balance(WALLET, wallet_transactions[WALLET], 100, 200, 300)
+    assert engine.simulate_balances([WALLET], 100, 200, 300)[WALLET] == expected
+
+
+def test_unknown_wallet_has_empty_results():
+    engine = ColumnarEngine([Transfer(1, 150, 0, "0x1", OTHER, OTHER, 5, 0)])
+    assert engine.simulate_balances([WALLET], 100, 200, 300) == {WALLET: (Decimal("0"), Decimal("0"), 0, 0)}
+    assert engine.token_frequency_passes([WALLET], 60, 5, 10) == {WALLET: True}
+
+
+def test_mixed_decimals_fall_back_to_per_wallet_path():
+    transfers = [
+        Transfer(1, 150, 0, "0x1", OTHER, WALLET, 500, 2),
+        Transfer(2, 160, 0, "0x2", OTHER, WALLET, 5, 0)
+    ]
+    analyzer = _analyzer()
+    engine = analyzer.build_columnar_engine(transfers)
+    balances = analyzer.simulate_wallet_balances([WALLET], {WALLET: transfers}, 100, 200, 300, engine)
+    assert engine is None
+    assert balances[WALLET] == analyzer.simulate_wallet_balance(WALLET, transfers, 100, 200, 300)
+
+
+def test_small_periods_skip_the_engine():
+    analyzer = _analyzer()
+    analyzer.columnar_min_transfers = 10
+    assert analyzer.build_columnar_engine([Transfer(1, 150, 0, "0x1", OTHER, WALLET, 5, 0)]) is None
@@ -0,0 +1,32 @@
+from backend.filter_chain import FilterChain, WalletFilter
+
+
+def _filter(name, cost, keep, calls):
+    async def apply(wallets):
+        calls.append((name, list(wallets)))
+        return [wallet for wallet in wallets if keep(wallet)]
+    return WalletFilter(name, cost, apply)
+
+
+def test_filters_run_cheapest_first_on_survivors_only():
+    calls = []
+    chain = FilterChain([
+        _filter("network", WalletFilter.NETWORK, lambda wallet: wallet != "c", calls),
+        _filter("local", WalletFilter.LOCAL, lambda wallet: wallet != "a", calls),
+        _filter("cache", WalletFilter.CACHE, lambda wallet: wallet != "b", calls),
+    ])
+
+    assert chain.run(["a", "b", "c", "d"]) == ["d"]
+    assert calls == [("cache", ["a", "b", "c", "d"]), ("local", ["a", "c", "d"]), ("network", ["c", "d"])]
+    assert chain.stats == [("cache", 4, 3), ("local", 3, 2), ("network", 2, 1)]
+
+
+def test_chain_stops_once_no_wallet_is_left():
+    calls = []
+    chain = FilterChain([
+        _filter("local", WalletFilter.LOCAL, lambda wallet: False, calls),
+        _filter("network", WalletFilter.NETWORK, lambda wallet: True, calls),
+    ])
+
+    assert chain.run(["a"]) == []
+    assert [name for name, _ in calls] == ["local"]
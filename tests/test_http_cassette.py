@@ -0,0 +1,61 @@
+import gzip
+
+import pytest
+import requests
+
+from backend.http_cassette import CassetteMissError, HttpCassette
+
+URL = "https://api.etherscan.io/v2/api?chainid=1"
+
+
+def _response(status: int, body: str) -> requests.Response:
+    response = requests.Response()
+    response.status_code = status
+    response.headers["Content-Type"] = "application/json"
+    response.encoding = "utf-8"
+    response._content = body.encode("utf-8")
+    return response
+
+
+def test_recorded_run_replays_without_api_key(tmp_path):
+    path = str(tmp_path / "run.jsonl.gz")
+    recorder = HttpCassette(path, HttpCassette.RECORD)
+    recorder.record(URL, {"module": "block", "apikey": "secret"}, _response(200, '{"result": "42"}'))
+    recorder.save()
+
+    replayed = HttpCassette(path, HttpCassette.REPLAY).replay(URL, {"module": "block", "apikey": "other"})
+    assert replayed.status_code == 200
+    assert replayed.json() == {"result": "42"}
+    assert replayed.headers["content-type"] == "application/json"
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        assert "secret" not in f.read()
+
+
+def test_repeated_requests_replay_in_recorded_order(tmp_path):
+    path = str(tmp_path / "run.jsonl.gz")
+    recorder = HttpCassette(path, HttpCassette.RECORD)
+    recorder.record(URL, {"page": 1}, _response(429, "slow down"))
+    recorder.record(URL, {"page": 1}, _response(200, "{}"))
+    recorder.save()
+
+    cassette = HttpCassette(path, HttpCassette.REPLAY)
+    assert [cassette.replay(URL, {"page": 1}).status_code for _ in range(3)] == [429, 200, 200]
+
+
+def test_unrecorded_request_is_reported(tmp_path):
+    path = str(tmp_path / "run.jsonl.gz")
+    HttpCassette(path, HttpCassette.RECORD).save()
+    with pytest.raises(CassetteMissError):
+        HttpCassette(path, HttpCassette.REPLAY).replay(URL, {"page": 2})
+
+
+def test_interactions_are_on_disk_before_save(tmp_path):
+    path = str(tmp_path / "run.jsonl.gz")
+    recorder = HttpCassette(path, HttpCassette.RECORD)
+    recorder.record(URL, {"page": 1}, _response(200, '{"result": "1"}'))
+    recorder.record(URL, {"page": 2}, _response(200, '{"result": "2"}'))
+
+    cassette = HttpCassette(path, HttpCassette.REPLAY)
+    assert cassette.replay(URL, {"page": 1}).json() == {"result": "1"}
+    assert cassette.replay(URL, {"page": 2}).json() == {"result": "2"}
+    recorder.save()
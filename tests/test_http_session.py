@@ -0,0 +1,29 @@
+from backend.http_session import HttpSessionPool
+
+
+def test_session_is_shared_per_host():
+    pool = HttpSessionPool()
+    try:
+        first = pool.get_session("https://api.etherscan.io/v2/api?chainid=1")
+        second = pool.get_session("https://API.etherscan.io/v2/api?chainid=56")
+        assert first is second
+    finally:
+        pool.close()
+
+
+def test_each_host_gets_its_own_session():
+    pool = HttpSessionPool()
+    try:
+        etherscan = pool.get_session("https://api.etherscan.io/v2/api")
+        dexscreener = pool.get_session("https://api.dexscreener.com/latest/dex/tokens/0x1")
+        assert etherscan is not dexscreener
+    finally:
+        pool.close()
+
+
+def test_sessions_negotiate_gzip():
+    pool = HttpSessionPool()
+    try:
+        assert "gzip" in pool.get_session("https://api.coingecko.com").headers["Accept-Encoding"]
+    finally:
+        pool.close()
@@ -0,0 +1,30 @@
+import json
+
+import pytest
+
+from shared.json_codec import JsonCodec, StdlibJsonBackend
+
+PAYLOAD = {"status": "1", "result": [{"value": "9007199254740993", "tokenName": "Żabka"}]}
+
+
+@pytest.mark.parametrize("backend", JsonCodec.available_backends(), ids=lambda backend: backend.name)
+def test_backends_round_trip(backend):
+    assert backend.loads(backend.dumps(PAYLOAD)) == PAYLOAD
+    assert backend.loads(backend.dumps(PAYLOAD, indent=True)) == PAYLOAD
+    assert backend.loads(backend.dumps(PAYLOAD).encode("utf-8")) == PAYLOAD
+
+
+@pytest.mark.parametrize("backend", JsonCodec.available_backends(), ids=lambda backend: backend.name)
+def test_backends_raise_stdlib_decode_error(backend):
+    with pytest.raises(json.JSONDecodeError):
+        backend.loads("{not json")
+
+
+def test_stdlib_is_always_available():
+    assert isinstance(JsonCodec.available_backends()[-1], StdlibJsonBackend)
+
+
+def test_file_helpers_round_trip(tmp_path):
+    path = str(tmp_path / "cache.json")
+    JsonCodec.save_file(PAYLOAD, path, indent=True)
+    assert JsonCodec.load_file(path) == PAYLOAD
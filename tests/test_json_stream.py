@@ -0,0 +1,33 @@
+import json
+
+import pytest
+
+from backend.json_stream import StreamedJsonArray, StreamedJsonObject
+
+
+def test_header_fields_are_decoded_eagerly_and_items_lazily():
+    payload = json.dumps({"status": "1", "message": "OK", "result": [{"hash": "0x1"}, {"hash": "0x2"}]}, indent=2)
+    data = StreamedJsonObject(payload, "result")
+    assert data["status"] == "1"
+    assert data["message"] == "OK"
+    assert isinstance(data["result"], StreamedJsonArray)
+    assert list(data["result"]) == [{"hash": "0x1"}, {"hash": "0x2"}]
+
+
+def test_array_can_be_iterated_more_than_once():
+    data = StreamedJsonObject('{"result":[1,2,3]}', "result")
+    assert list(data["result"]) == list(data["result"]) == [1, 2, 3]
+
+
+def test_empty_array():
+    assert list(StreamedJsonObject('{"status":"0","result": [ ]}', "result")["result"]) == []
+
+
+def test_non_array_field_is_decoded_normally():
+    data = StreamedJsonObject('{"status":"0","message":"NOTOK","result":"Max rate limit reached"}', "result")
+    assert data == {"status": "0", "message": "NOTOK", "result": "Max rate limit reached"}
+
+
+def test_malformed_payload_raises_decode_error():
+    with pytest.raises(json.JSONDecodeError):
+        list(StreamedJsonObject('{"result":[{"a":1} {"b":2}]}', "result")["result"])
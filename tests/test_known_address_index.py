@@ -0,0 +1,51 @@
+from backend.known_address_index import BloomFilter, KnownAddressIndex
+from shared.json_codec import JsonCodec
+
+ROUTER = "0x7a250d5630B4cF539739dF2C5dAcb4c659F2488D"
+PANCAKE = "0x10ED43C718714eb63d5aA57B78B54704E256024E"
+DEAD = "0x000000000000000000000000000000000000dEaD"
+
+
+def test_load_merges_shared_and_network_sections(tmp_path):
+    path = str(tmp_path / "known_addresses.json")
+    JsonCodec.save_file({"ALL": {DEAD: "Burn address"}, "ETH": {ROUTER: "Uniswap V2 Router"},
+                         "BSC": {PANCAKE: "PancakeSwap V2 Router"}}, path)
+
+    index = KnownAddressIndex.load(path, "eth")
+
+    assert ROUTER.lower() in index
+    assert DEAD.lower() in index
+    assert PANCAKE.lower() not in index
+    assert index.label(ROUTER) == "Uniswap V2 Router"
+
+
+def test_missing_file_gives_empty_index(tmp_path):
+    assert len(KnownAddressIndex.load(str(tmp_path / "missing.json"), "ETH")) == 0
+
+
+def test_dexscreener_pairs_are_added():
+    index = KnownAddressIndex()
+    index.add_pairs([{"dexId": "uniswap", "pairAddress": "0xA43fe16908251ee70EF74718545e4FE6C5cCEc9f"}, {"dexId": "x"}])
+    assert "0xa43fe16908251ee70ef74718545e4fe6c5ccec9f" in index
+    assert len(index) == 1
+
+
+def test_large_label_lists_use_bloom_filter():
+    labels = {f"0x{index:040x}": "exchange" for index in range(2000)}
+    index = KnownAddressIndex(labels, bloom_min_entries=1000)
+
+    assert index._bloom is not None
+    assert all(address in index for address in labels)
+    assert len(index) == 2000
+
+    index.add(ROUTER, "Uniswap V2 Router")
+    assert ROUTER.lower() in index
+
+
+def test_bloom_filter_false_positive_rate_stays_near_target():
+    bloom = BloomFilter(5000, 0.01)
+    for index in range(5000):
+        bloom.add(f"member-{index}")
+
+    false_positives = sum(f"other-{index}" in bloom for index in range(20000))
+    assert false_positives < 20000 * 0.03
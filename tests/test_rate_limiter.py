@@ -0,0 +1,39 @@
+import pytest
+
+from backend.rate_limiter import RateLimiter, TokenBucket
+
+
+def test_bucket_serves_burst_without_waiting():
+    bucket = TokenBucket(rate=1.0, burst=3.0)
+    assert [bucket.try_acquire() for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert bucket.try_acquire() > 0
+
+
+def test_throttle_halves_rate_and_drains_tokens():
+    bucket = TokenBucket(rate=4.0, burst=4.0)
+    bucket.on_throttle()
+    assert bucket.rate == 2.0
+    assert bucket.try_acquire() == pytest.approx(0.5, abs=0.05)
+
+
+def test_rate_recovers_additively_up_to_configured_maximum():
+    bucket = TokenBucket(rate=4.0, burst=4.0)
+    bucket.on_throttle()
+    for _ in range(1000):
+        bucket.on_success()
+    assert bucket.rate == 4.0
+
+
+def test_rate_never_drops_below_floor():
+    bucket = TokenBucket(rate=4.0, burst=4.0)
+    for _ in range(50):
+        bucket.on_throttle()
+    assert bucket.rate == pytest.approx(0.4)
+
+
+def test_buckets_are_separate_per_host_and_key():
+    limiter = RateLimiter({"api.etherscan.io": (5.0, 5.0)})
+    first_key = limiter.get_bucket("https://api.etherscan.io/v2/api?chainid=1", "key-a")
+    assert limiter.get_bucket("https://api.etherscan.io/v2/api?chainid=56", "key-a") is first_key
+    assert limiter.get_bucket("https://api.etherscan.io/v2/api", "key-b") is not first_key
+    assert limiter.get_bucket("https://api.dexscreener.com/latest", None) is not first_key
@@ -0,0 +1,71 @@
+from backend.response_cache import ResponseCache
+
+
+def test_key_ignores_api_key_and_param_order():
+    first = ResponseCache.make_key("https://api", {"module": "block", "timestamp": 1, "apikey": "a"})
+    second = ResponseCache.make_key("https://api", {"timestamp": "1", "apikey": "b", "module": "block"})
+    assert first == second
+    assert first != ResponseCache.make_key("https://other", {"module": "block", "timestamp": 1})
+
+
+def test_stored_body_is_returned(tmp_path):
+    cache = ResponseCache(str(tmp_path / "cache.sqlite"))
+    cache.put("key", '{"result": "1"}')
+    assert cache.get("key") == '{"result": "1"}'
+    assert (cache.hits, cache.misses) == (1, 0)
+    cache.close()
+
+
+def test_expired_entry_is_a_miss(tmp_path):
+    cache = ResponseCache(str(tmp_path / "cache.sqlite"))
+    cache.put("key", "body", ttl=-1)
+    assert cache.get("key") is None
+    cache.close()
+
+
+def test_deleted_entry_is_a_miss_and_frees_its_bytes(tmp_path):
+    cache = ResponseCache(str(tmp_path / "cache.sqlite"))
+    cache.put("key", "body")
+    cache.delete("key")
+    cache.delete("key")
+    assert cache.get("key") is None
+    assert cache._total_bytes == 0
+    cache.close()
+
+
+def test_bypass_skips_reads_but_refreshes_entries(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    cache = ResponseCache(path, bypass=True)
+    cache.put("key", "fresh")
+    assert cache.get("key") is None
+    cache.close()
+    assert ResponseCache(path).get("key") == "fresh"
+
+
+def test_disabled_cache_never_touches_its_file(tmp_path):
+    path = str(tmp_path / "cache" / "cache.sqlite")
+    cache = ResponseCache(path, disabled=True)
+    cache.put("key", "body")
+    assert cache.get("key") is None
+    cache.close()
+    assert not (tmp_path / "cache").exists()
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    cache = ResponseCache(str(tmp_path / "cache.sqlite"), max_bytes=10)
+    cache.put("old", "aaaa")
+    cache.put("recent", "bbbb")
+    cache.get("old")
+    cache.put("new", "cccc")
+    assert cache.get("recent") is None
+    assert cache.get("old") == "aaaa"
+    assert cache.get("new") == "cccc"
+    cache.close()
+
+
+def test_entries_survive_reopening(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    cache = ResponseCache(path)
+    cache.put("key", "body")
+    cache.close()
+    assert ResponseCache(path).get("key") == "body"
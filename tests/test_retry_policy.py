@@ -0,0 +1,71 @@
+import time
+
+import requests
+
+from backend.retry_policy import CircuitBreaker, RetryPolicy
+
+
+def _response_with_retry_after(value: str) -> requests.Response:
+    response = requests.Response()
+    response.status_code = 429
+    response.headers["Retry-After"] = value
+    return response
+
+
+def test_full_jitter_stays_within_exponential_cap():
+    policy = RetryPolicy(base_delay=1.0, max_delay=5.0)
+    for attempt, cap in [(1, 1.0), (2, 2.0), (3, 4.0), (6, 5.0)]:
+        assert all(0 <= policy.delay_for(attempt) <= cap for _ in range(50))
+
+
+def test_retry_after_seconds_is_honored():
+    policy = RetryPolicy(base_delay=1.0, max_delay=30.0)
+    assert policy.delay_for(1, _response_with_retry_after("7"), throttled=True) == 7.0
+
+
+def test_retry_after_is_capped_by_max_delay():
+    policy = RetryPolicy(base_delay=1.0, max_delay=3.0)
+    assert policy.delay_for(1, _response_with_retry_after("120")) == 3.0
+
+
+def test_past_http_date_means_no_wait():
+    assert RetryPolicy.parse_retry_after(_response_with_retry_after("Wed, 21 Oct 2015 07:28:00 GMT")) == 0.0
+
+
+def test_throttle_without_hint_leaves_pacing_to_rate_limiter():
+    assert RetryPolicy().delay_for(3, throttled=True) == 0.0
+
+
+def test_retry_counts_are_reported_per_endpoint():
+    policy = RetryPolicy()
+    policy.record_retry("api.etherscan.io tokentx", 0.5)
+    policy.record_retry("api.etherscan.io tokentx", 1.0)
+    assert policy.stats() == {"api.etherscan.io tokentx": {"retries": 2, "waited_seconds": 1.5}}
+
+
+def test_breaker_opens_after_threshold_and_probes_after_reset():
+    breaker = CircuitBreaker(failure_threshold=2, reset_seconds=0.0)
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.CLOSED
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert breaker.allow_request() is True
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+
+
+def test_open_breaker_fails_fast():
+    breaker = CircuitBreaker(failure_threshold=1, reset_seconds=60.0)
+    breaker.record_failure()
+    assert breaker.allow_request() is False
+
+
+def test_unreported_half_open_probe_is_replaced_after_reset():
+    breaker = CircuitBreaker(failure_threshold=1, reset_seconds=0.05)
+    breaker.record_failure()
+    time.sleep(0.06)
+    assert breaker.allow_request() is True
+    assert breaker.allow_request() is False
+    time.sleep(0.06)
+    assert breaker.allow_request() is True
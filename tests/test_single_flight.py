@@ -0,0 +1,86 @@
+import threading
+import time
+
+import pytest
+
+from backend.single_flight import SingleFlight
+
+
+def test_concurrent_callers_share_one_call():
+    flight = SingleFlight()
+    calls = []
+    results = []
+
+    def fetch():
+        calls.append(1)
+        time.sleep(0.05)
+        return {"pairs": []}
+
+    threads = [threading.Thread(target=lambda: results.append(flight.do("pairs", fetch))) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert flight.shared_count == 4
+    assert all(result == {"pairs": []} for result in results)
+    assert len({id(result) for result in results}) == 5
+
+
+def test_followers_cannot_mutate_each_others_result():
+    flight = SingleFlight()
+    started = threading.Event()
+    follower_results = []
+
+    def fetch():
+        started.set()
+        time.sleep(0.05)
+        return {"result": [{"hash": "0x1"}]}
+
+    def follower():
+        started.wait()
+        result = flight.do("key", lambda: {"result": []})
+        follower_results.append(result)
+        result["result"].clear()
+
+    thread = threading.Thread(target=follower)
+    thread.start()
+    leader_result = flight.do("key", fetch)
+    thread.join()
+
+    assert flight.shared_count == 1
+    assert leader_result == {"result": [{"hash": "0x1"}]}
+    assert follower_results == [{"result": []}]
+
+
+def test_finished_call_is_not_reused():
+    flight = SingleFlight()
+    assert flight.do("key", lambda: 1) == 1
+    assert flight.do("key", lambda: 2) == 2
+
+
+def test_error_is_raised_for_every_waiter():
+    flight = SingleFlight()
+    started = threading.Event()
+    errors = []
+
+    def failing():
+        started.set()
+        time.sleep(0.05)
+        raise ValueError("upstream down")
+
+    def follower():
+        started.wait()
+        try:
+            flight.do("key", lambda: "not called")
+        except ValueError as e:
+            errors.append(e)
+
+    thread = threading.Thread(target=follower)
+    thread.start()
+    with pytest.raises(ValueError):
+        flight.do("key", failing)
+    thread.join()
+
+    assert len(errors) == 1
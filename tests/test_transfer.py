@@ -0,0 +1,82 @@
+import pytest
+
+from backend.transfer import Transfer, TransferTimeline
+
+
+def _api_transfer(**overrides):
+    tx = {
+        "blockNumber": "19000000",
+        "timeStamp": "1710000000",
+        "hash": "0xabc",
+        "from": "0xAbCdEf0000000000000000000000000000000001",
+        "to": "0x00000000000000000000000000000000000000FF",
+        "value": "1000000000000000000000000",
+        "tokenDecimal": "18",
+        "logIndex": "7",
+        "tokenName": "Pepe"
+    }
+    tx.update(overrides)
+    return tx
+
+
+def test_from_api_parses_numbers_once():
+    transfer = Transfer.from_api(_api_transfer())
+    assert transfer.block == 19000000
+    assert transfer.timestamp == 1710000000
+    assert transfer.log_index == 7
+    assert transfer.value == 10 ** 24
+    assert transfer.decimals == 18
+
+
+def test_from_api_lowercases_and_interns_addresses():
+    first = Transfer.from_api(_api_transfer())
+    second = Transfer.from_api(_api_transfer(hash="0xdef"))
+    assert first.sender == "0xabcdef0000000000000000000000000000000001"
+    assert first.recipient == "0x00000000000000000000000000000000000000ff"
+    assert first.sender is second.sender
+
+
+def test_missing_optional_fields_default_to_zero():
+    transfer = Transfer.from_api({"timeStamp": "1", "from": "0xa", "to": "0xb", "value": "5"})
+    assert (transfer.block, transfer.log_index, transfer.decimals, transfer.hash) == (0, 0, 0, "")
+
+
+def test_transfer_has_no_instance_dict():
+    assert not hasattr(Transfer.from_api(_api_transfer()), "__dict__")
+
+
+def _at(timestamp):
+    return Transfer.from_api(_api_transfer(timeStamp=str(timestamp), hash=f"0x{timestamp}"))
+
+
+def test_timeline_sorts_unordered_input_by_timestamp():
+    timeline = TransferTimeline([_at(30), _at(10), _at(20)])
+    assert [tx.timestamp for tx in timeline] == [10, 20, 30]
+
+
+def test_timeline_bounds_include_both_window_edges():
+    timeline = TransferTimeline([_at(ts) for ts in (10, 20, 20, 30, 40)])
+    assert timeline.bounds(20, 30) == (1, 4)
+    assert timeline.bounds(41, 50) == (5, 5)
+    assert [tx.timestamp for tx in timeline.window(15, 35)] == [20, 20, 30]
+
+
+def test_timeline_window_covering_everything_returns_same_timeline():
+    timeline = TransferTimeline([_at(10), _at(20)])
+    assert timeline.window(0, 100) is timeline
+
+
+def test_timeline_select_keeps_order_of_indices():
+    timeline = TransferTimeline([_at(ts) for ts in (10, 20, 30)])
+    selected = timeline.select([0, 2])
+    assert [tx.timestamp for tx in selected] == [10, 30]
+    assert selected.bounds(11, 30) == (1, 2)
+
+
+def test_timeline_extend_rejects_out_of_order_batch():
+    timeline = TransferTimeline([_at(10), _at(20)])
+    timeline.extend(TransferTimeline([_at(20), _at(25)]))
+    assert len(timeline) == 4
+
+    with pytest.raises(ValueError):
+        timeline.extend(TransferTimeline([_at(5)]))
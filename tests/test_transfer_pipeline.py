@@ -0,0 +1,122 @@
+import pytest
+
+from backend.async_api_client import AsyncApiClient
+from backend.blockchain_analyzer import BlockchainAnalyzer
+from backend.known_address_index import KnownAddressIndex
+from backend.retry_policy import RetryPolicy
+from backend.transfer import Transfer
+from backend.transfer_pipeline import TransferPipeline, WalletActivity
+
+CONTRACT = "0x3333333333333333333333333333333333333333"
+BASE_TIMESTAMP = 1700000000
+
+
+class TransferApiClient:
+
+    api_url = "https://api.etherscan.io/v2/api?chainid=1"
+    api_key = "test-key"
+    retry_policy = RetryPolicy(base_delay=0.0, max_delay=0.0)
+
+    def __init__(self, fail_from_block=None):
+        self.fail_from_block = fail_from_block
+
+    def make_request_with_retry(self, url, params, retries=None, cache_ttl=None, validate=None, decode=None):
+        start, end = params["startblock"], params["endblock"]
+        if self.fail_from_block is not None and end >= self.fail_from_block:
+            return None
+        result = [
+            {
+                "blockNumber": str(block),
+                "timeStamp": str(BASE_TIMESTAMP + block * 12),
+                "hash": f"0x{block:x}",
+                "logIndex": "0",
+                "from": f"0x{block % 7:040x}",
+                "to": f"0x{block % 11:040X}",
+                "value": "1"
+            }
+            for block in range(start, end + 1, 3)
+        ]
+        return {"status": "1", "message": "OK", "result": result}
+
+
+def _analyzer(api_client):
+    return BlockchainAnalyzer(api_client, AsyncApiClient(api_client, max_in_flight=4))
+
+
+def test_pipeline_matches_batch_processing():
+    api_client = TransferApiClient()
+    analyzer = _analyzer(api_client)
+    t1, t2, t3 = BASE_TIMESTAMP + 12 * 500, BASE_TIMESTAMP + 12 * 2000, BASE_TIMESTAMP + 12 * 4000
+
+    activity = TransferPipeline(analyzer, queue_size=1).run(0, 5000, CONTRACT, t1, t2, t3)
+
+    all_transactions = analyzer.get_token_transactions(0, 5000, CONTRACT)
+    in_period = analyzer.filter_transactions_by_timerange(all_transactions, t1, t3)
+    assert activity.transfer_count == len(all_transactions)
+    assert activity.in_period_count == len(in_period)
+    assert dict(activity.wallet_transactions) == {
+        wallet: transactions for wallet, transactions in analyzer.group_transactions_by_wallet(in_period).items()
+        if wallet in activity.candidate_wallets
+    }
+    assert activity.candidate_wallets == analyzer.find_candidate_wallets(in_period, t1, t2)
+
+
+def test_fetch_failure_propagates_out_of_pipeline():
+    analyzer = _analyzer(TransferApiClient(fail_from_block=3000))
+    with pytest.raises(Exception, match="attempts"):
+        TransferPipeline(analyzer).run(0, 5000, CONTRACT, BASE_TIMESTAMP, BASE_TIMESTAMP + 1, BASE_TIMESTAMP + 2)
+
+
+def _transfer(index, timestamp, sender, recipient):
+    return Transfer(index, timestamp, 0, f"0x{index:x}", sender, recipient, 1, 0)
+
+
+def test_activity_indexes_only_candidates_with_their_earlier_transfers():
+    buyer, seller, router = "0xb", "0xs", "0xr"
+    transfers = [
+        _transfer(0, 100, buyer, router),
+        _transfer(1, 150, router, buyer),
+        _transfer(2, 210, seller, router),
+        _transfer(3, 250, buyer, router),
+        _transfer(4, 260, router, seller)
+    ]
+    activity = WalletActivity(purchase_start=120, purchase_end=200)
+    activity.add_transfers(transfers[:2])
+    activity.add_transfers(transfers[2:])
+
+    assert activity.candidate_wallets == [buyer]
+    assert dict(activity.wallet_transactions) == {buyer: [transfers[0], transfers[1], transfers[3]]}
+    assert activity.candidate_transfers() == [transfers[0], transfers[1], transfers[3]]
+    assert activity._pending is None
+
+
+def test_activity_matches_full_grouping_for_candidates():
+    api_client = TransferApiClient()
+    analyzer = _analyzer(api_client)
+    t1, t2, t3 = BASE_TIMESTAMP + 12 * 500, BASE_TIMESTAMP + 12 * 2000, BASE_TIMESTAMP + 12 * 4000
+    in_period = analyzer.filter_transactions_by_timerange(analyzer.get_token_transactions(0, 5000, CONTRACT), t1, t3)
+
+    activity = WalletActivity(t1, t2)
+    activity.add_transfers(in_period)
+    grouped = analyzer.group_transactions_by_wallet(in_period)
+
+    assert set(activity.wallet_transactions) == set(activity.candidate_wallets)
+    assert {wallet: activity.wallet_transactions[wallet] for wallet in activity.candidate_wallets} == {
+        wallet: grouped[wallet] for wallet in activity.candidate_wallets
+    }
+
+
+def test_activity_skips_known_addresses_as_candidates():
+    buyer, pair = "0xb", "0xp"
+    transfers = [
+        _transfer(0, 130, pair, buyer),
+        _transfer(1, 140, buyer, pair),
+        _transfer(2, 150, pair, buyer)
+    ]
+    known = KnownAddressIndex({pair: "Uniswap pair"})
+    activity = WalletActivity(purchase_start=120, purchase_end=200, known_addresses=known)
+    activity.add_transfers(transfers)
+
+    assert activity.candidate_wallets == [buyer]
+    assert activity.excluded_wallets == {pair}
+    assert _analyzer(TransferApiClient()).find_candidate_wallets(transfers, 120, 200, known) == [buyer]
@@ -0,0 +1,58 @@
+import sqlite3
+
+from backend.transfer import Transfer
+from backend.transfer_store import TransferStore
+
+CONTRACT = "0x3333333333333333333333333333333333333333"
+
+
+def _tx(block, log_index=0):
+    return Transfer(block, 1700000000 + block * 12, log_index, f"0x{block:x}", "0xaa", "0xbb", 10 ** 30, 18)
+
+
+def test_missing_intervals_skip_covered_ranges(tmp_path):
+    store = TransferStore(str(tmp_path / "transfers.sqlite"))
+    store.add(1, CONTRACT, 100, 199, [])
+    store.add(1, CONTRACT, 300, 399, [])
+    assert store.missing_intervals(1, CONTRACT, 50, 450) == [(50, 99), (200, 299), (400, 450)]
+    assert store.missing_intervals(1, CONTRACT, 120, 180) == []
+    assert store.missing_intervals(56, CONTRACT, 120, 180) == [(120, 180)]
+
+
+def test_adjacent_intervals_are_merged(tmp_path):
+    store = TransferStore(str(tmp_path / "transfers.sqlite"))
+    store.add(1, CONTRACT, 100, 199, [])
+    store.add(1, CONTRACT, 200, 299, [])
+    assert store._coverage(1, CONTRACT) == [(100, 299)]
+
+
+def test_load_returns_transfers_in_block_order(tmp_path):
+    store = TransferStore(str(tmp_path / "transfers.sqlite"))
+    store.add(1, CONTRACT.upper(), 200, 299, [_tx(250, 0), _tx(250, 1)])
+    store.add(1, CONTRACT, 100, 199, [_tx(150), _tx(150)])
+    store.add(1, CONTRACT, 100, 199, [_tx(150), _tx(150)])
+    loaded = store.load(1, CONTRACT, 0, 1000)
+    assert [(tx.block, tx.log_index) for tx in loaded] == [(150, 0), (150, 0), (250, 0), (250, 1)]
+    assert store.load(1, CONTRACT, 200, 1000) == [_tx(250, 0), _tx(250, 1)]
+
+
+def test_iter_load_pages_through_large_ranges(tmp_path, monkeypatch):
+    monkeypatch.setattr(TransferStore, "BATCH_SIZE", 2)
+    store = TransferStore(str(tmp_path / "transfers.sqlite"))
+    store.add(1, CONTRACT, 0, 99, [_tx(block, log_index) for block in range(10, 13) for log_index in range(2)])
+    batches = list(store.iter_load(1, CONTRACT, 11, 99))
+    assert [len(batch) for batch in batches] == [2, 2]
+    assert [(tx.block, tx.log_index) for batch in batches for tx in batch] == [(11, 0), (11, 1), (12, 0), (12, 1)]
+
+
+def test_store_from_older_schema_is_rebuilt(tmp_path):
+    db_path = str(tmp_path / "transfers.sqlite")
+    connection = sqlite3.connect(db_path)
+    connection.execute("CREATE TABLE transfers (payload TEXT)")
+    connection.execute("CREATE TABLE coverage (chain_id INTEGER, contract TEXT, start_block INTEGER, end_block INTEGER)")
+    connection.execute("INSERT INTO coverage VALUES (1, ?, 0, 1000)", (CONTRACT,))
+    connection.commit()
+    connection.close()
+
+    store = TransferStore(db_path)
+    assert store.missing_intervals(1, CONTRACT, 0, 1000) == [(0, 1000)]
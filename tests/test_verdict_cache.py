@@ -0,0 +1,53 @@
+import time
+
+from backend.verdict_cache import VerdictCache
+
+WALLET = "0x1111111111111111111111111111111111111111"
+OTHER = "0x2222222222222222222222222222222222222222"
+
+
+def test_stores_both_passes_and_rejections():
+    cache = VerdictCache()
+    cache.put(WALLET, True)
+    cache.put(OTHER, False)
+    assert cache.get(WALLET) is True
+    assert cache.get(OTHER) is False
+    assert cache.get("0x3333333333333333333333333333333333333333") is None
+    assert (cache.hits, cache.misses) == (2, 1)
+
+
+def test_expired_verdict_is_ignored_and_compacted_away():
+    cache = VerdictCache(ttl_seconds=60)
+    cache.put(WALLET, True)
+    cache._connection.execute("UPDATE verdicts SET checked_at = ?", (time.time() - 61,))
+    assert cache.get(WALLET) is None
+
+    cache.compact()
+    assert len(cache) == 0
+
+
+def test_compaction_keeps_newest_verdicts_within_size_limit():
+    cache = VerdictCache(max_entries=2, compact_every=3)
+    wallets = [f"0x{index:040x}" for index in range(3)]
+    for wallet in wallets:
+        cache.put(wallet, True)
+        time.sleep(0.001)
+    assert [cache.get(wallet) for wallet in wallets] == [None, True, True]
+
+
+def test_scope_separates_networks_and_parameters():
+    params = {"frequency_interval_seconds": 60, "min_frequency_violations": 5}
+    eth = VerdictCache.make_scope(1, params)
+    assert eth == VerdictCache.make_scope(1, dict(reversed(list(params.items()))))
+    assert eth != VerdictCache.make_scope(56, params)
+    assert eth != VerdictCache.make_scope(1, {**params, "min_frequency_violations": 3})
+
+
+def test_each_verdict_is_committed_as_soon_as_it_is_stored(tmp_path):
+    path = str(tmp_path / "verdicts.sqlite")
+    cache = VerdictCache(path, scope="1:abc")
+    cache.put(WALLET, True)
+
+    assert VerdictCache(path, scope="1:abc").get(WALLET) is True
+    assert VerdictCache(path, scope="1:def").get(WALLET) is None
+    cache.close()
@@ -1,5 +1,11 @@
+import asyncio
+import threading
+import time
 from decimal import Decimal
 
+from backend.async_api_client import AsyncApiClient
+from backend.transfer import Transfer
+from backend.verdict_cache import VerdictCache
 from backend.wallet_analyzer import WalletAnalyzer
 
 WALLET = "0x1111111111111111111111111111111111111111"
@@ -10,14 +16,14 @@ def _bare_analyzer() -> WalletAnalyzer:
     return object.__new__(WalletAnalyzer)
 
 
-def _tx(timestamp: int, sender: str, recipient: str, value: int, decimals: int = 0) -> dict:
-    return {
+def _tx(timestamp: int, sender: str, recipient: str, value: int, decimals: int = 0) -> Transfer:
+    return Transfer.from_api({
         "timeStamp": str(timestamp),
         "from": sender,
         "to": recipient,
         "value": str(value),
         "tokenDecimal": str(decimals),
-    }
+    })
 
 
 def test_simulate_counts_purchases_and_sales():
@@ -55,10 +61,39 @@ def test_simulate_keeps_large_amounts_exact():
     assert purchased == Decimal(big) * 3
 
 
+
+def test_simulate_matches_per_transfer_decimal_arithmetic():
+    analyzer = _bare_analyzer()
+    values = [123456789012345678901, 987654321098765432, 5, 10 ** 24 + 7, 333333333333333333]
+    transactions = [
+        _tx(100 + i * 40, OTHER, WALLET, value, decimals=18) if i % 2 == 0 else _tx(100 + i * 40, WALLET, OTHER, value, decimals=18)
+        for i, value in enumerate(values)
+    ]
+
+    purchased = sum(Decimal(value) / 10 ** 18 for i, value in enumerate(values) if i % 2 == 0 and 100 + i * 40 <= 200)
+    balance = sum(Decimal(value) / 10 ** 18 * (1 if i % 2 == 0 else -1) for i, value in enumerate(values))
+
+    assert analyzer.simulate_wallet_balance(WALLET, transactions, 100, 200, 300) == (
+        round(purchased, 2), round(balance, 2), 2, 2
+    )
+
+
+def test_simulate_wallet_balances_resolves_decimals_once_per_token():
+    analyzer = _bare_analyzer()
+    wallet_transactions = {
+        WALLET: [_tx(100, OTHER, WALLET, 1500, decimals=2)],
+        OTHER: [],
+    }
+    balances = analyzer.simulate_wallet_balances([OTHER, WALLET], wallet_transactions, 100, 200, 300)
+    assert balances[WALLET] == (15.0, 15.0, 1, 0)
+    assert balances[OTHER] == (0, 0, 0, 0)
+
+
 def _frequency_analyzer() -> WalletAnalyzer:
     analyzer = object.__new__(WalletAnalyzer)
     analyzer.frequency_interval_seconds = 60
     analyzer.min_frequency_violations = 5
+    analyzer.txlist_checks = 0
     return analyzer
 
 
@@ -77,3 +112,178 @@ def test_frequency_accepts_spread_out_transactions():
 def test_frequency_accepts_single_transaction():
     analyzer = _frequency_analyzer()
     assert analyzer._check_transaction_frequency([_tx(1, OTHER, WALLET, 1)]) is True
+
+
+class SlowWalletApiClient:
+
+    def __init__(self, bursty_wallets):
+        self.bursty_wallets = bursty_wallets
+        self.requested = []
+        self.in_flight = 0
+        self.max_seen = 0
+        self._lock = threading.Lock()
+
+    def get_wallet_transactions(self, wallet_address, count=10):
+        with self._lock:
+            self.requested.append(wallet_address)
+            self.in_flight += 1
+            self.max_seen = max(self.max_seen, self.in_flight)
+        time.sleep(0.02 if wallet_address.endswith("0") else 0.005)
+        with self._lock:
+            self.in_flight -= 1
+        step = 10 if wallet_address in self.bursty_wallets else 1000
+        return [{"timeStamp": str(1000 + i * step), "from": wallet_address, "to": OTHER, "value": "1"} for i in range(count)]
+
+
+def test_filter_wallets_by_frequency_checks_concurrently_and_keeps_order():
+    wallets = [f"0x{index:040x}" for index in range(12)]
+    cached, bursty = wallets[1], {wallets[4], wallets[7]}
+    api_client = SlowWalletApiClient(bursty)
+    analyzer = _frequency_analyzer()
+    analyzer.min_transaction_count = 10
+    analyzer.frequency_check_concurrency = 3
+    analyzer.async_api_client = AsyncApiClient(api_client, max_in_flight=8)
+    analyzer.verdict_cache = VerdictCache()
+    analyzer.verdict_cache.put(cached, False)
+
+    try:
+        passed = analyzer.filter_wallets_by_frequency(wallets, {}, blockchain_analyzer=None)
+    finally:
+        analyzer.async_api_client.close()
+
+    assert passed == [wallet for wallet in wallets if wallet != cached and wallet not in bursty]
+    assert cached not in api_client.requested
+    assert 1 < api_client.max_seen <= 3
+    assert [analyzer.verdict_cache.get(wallet) for wallet in wallets] == [
+        wallet != cached and wallet not in bursty for wallet in wallets
+    ]
+
+
+def test_filter_wallets_by_frequency_skips_txlist_for_cached_passes():
+    wallets = [f"0x{index:040x}" for index in range(4)]
+    api_client = SlowWalletApiClient(set())
+    analyzer = _frequency_analyzer()
+    analyzer.min_transaction_count = 10
+    analyzer.frequency_check_concurrency = 2
+    analyzer.async_api_client = AsyncApiClient(api_client, max_in_flight=2)
+    analyzer.verdict_cache = VerdictCache()
+    analyzer.verdict_cache.put(wallets[0], True)
+
+    try:
+        passed = analyzer.filter_wallets_by_frequency(wallets, {}, blockchain_analyzer=None)
+    finally:
+        analyzer.async_api_client.close()
+
+    assert passed == wallets
+    assert sorted(api_client.requested) == wallets[1:]
+
+
+def test_select_wallets_matches_frequency_then_balance_with_fewer_txlist_calls():
+    holder, seller, bursty = (f"0x{index:040x}" for index in (1, 2, 3))
+    wallet_transactions = {
+        holder: [_tx(100, OTHER, holder, 10)],
+        seller: [_tx(100, OTHER, seller, 10), _tx(150, seller, OTHER, 9)],
+        bursty: [_tx(100, OTHER, bursty, 10)],
+    }
+    candidates = [holder, seller, bursty]
+
+    def analyzer_with(api_client):
+        analyzer = _frequency_analyzer()
+        analyzer.min_transaction_count = 10
+        analyzer.min_balance_percentage = Decimal("0.5")
+        analyzer.frequency_check_concurrency = 2
+        analyzer.async_api_client = AsyncApiClient(api_client, max_in_flight=2)
+        analyzer.verdict_cache = VerdictCache()
+        return analyzer
+
+    sequential_client = SlowWalletApiClient({bursty})
+    sequential = analyzer_with(sequential_client)
+    selected_client = SlowWalletApiClient({bursty})
+    selected = analyzer_with(selected_client)
+
+    try:
+        filtered = sequential.filter_wallets_by_frequency(candidates, wallet_transactions, blockchain_analyzer=None)
+        expected = sequential.analyze_wallet_balances(filtered, wallet_transactions, 100, 200, 300, None, None)
+        results = selected.select_wallets(candidates, wallet_transactions, 100, 200, 300, None, None)
+    finally:
+        sequential.async_api_client.close()
+        selected.async_api_client.close()
+
+    assert results == expected
+    assert [row["wallet"] for row in results] == [holder]
+    assert sorted(sequential_client.requested) == candidates
+    assert sorted(selected_client.requested) == [holder, bursty]
+    assert selected.txlist_checks == 2
+    assert selected.verdict_cache.misses == 3
+
+
+class FailingWalletApiClient:
+
+    def get_wallet_transactions(self, wallet_address, count=10):
+        return None
+
+
+def test_failed_txlist_check_rejects_wallet_without_caching_verdict():
+    api_client = FailingWalletApiClient()
+    analyzer = _frequency_analyzer()
+    analyzer.min_transaction_count = 10
+    analyzer.frequency_check_concurrency = 2
+    analyzer.api_client = api_client
+    analyzer.async_api_client = AsyncApiClient(api_client, max_in_flight=2)
+    analyzer.verdict_cache = VerdictCache()
+
+    try:
+        passed = analyzer.filter_wallets_by_frequency([WALLET], {}, blockchain_analyzer=None)
+    finally:
+        analyzer.async_api_client.close()
+
+    assert passed == []
+    assert analyzer.check_wallet_general_frequency(WALLET) is False
+    assert analyzer.verdict_cache.get(WALLET) is None
+
+
+class PathsConfigManager:
+
+    def __init__(self, verdict_cache_file):
+        self.verdict_cache_file = verdict_cache_file
+
+    def get_paths_config(self):
+        return {"verdict_cache_file": self.verdict_cache_file}
+
+
+class CassetteApiClient:
+
+    network_config = {"chain_id": 1}
+
+    def __init__(self, cassette):
+        self.cassette = cassette
+
+
+def test_verdict_cache_stays_in_memory_while_cassette_is_active(tmp_path):
+    verdict_cache_file = str(tmp_path / "verdicts" / "verdicts.sqlite")
+    recording = WalletAnalyzer(PathsConfigManager(verdict_cache_file), CassetteApiClient(object()))
+    plain = WalletAnalyzer(PathsConfigManager(verdict_cache_file), CassetteApiClient(None))
+
+    try:
+        assert recording.verdict_cache.db_path == VerdictCache.IN_MEMORY
+        assert plain.verdict_cache.db_path == verdict_cache_file
+    finally:
+        for analyzer in (recording, plain):
+            analyzer.close()
+            analyzer.async_api_client.close()
+
+
+def test_token_frequency_rejection_is_not_persisted():
+    analyzer = _frequency_analyzer()
+    analyzer.min_transaction_count = 5
+    analyzer.verdict_cache = VerdictCache()
+    analyzer.verdict_cache.put(WALLET, True)
+    bursty = {WALLET: [_tx(1000 + i * 10, OTHER, WALLET, 1) for i in range(7)], OTHER: []}
+
+    token_filter = analyzer._token_frequency_filter(bursty, engine=None)
+    passed = asyncio.run(token_filter.apply([WALLET, OTHER]))
+
+    assert passed == [OTHER]
+    assert analyzer.check_wallet_token_frequency(WALLET, bursty[WALLET]) is False
+    assert analyzer.verdict_cache.get(WALLET) is True
+    assert analyzer.verdict_cache.get(OTHER) is None